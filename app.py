@@ -4,135 +4,26 @@ import pandas as pd
 from datetime import datetime, timedelta, date
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
 import hashlib
-import calendar
+import logging
+import time
+from pathlib import Path
+
+from charts import content_key, daily_figure, donut_figure, lttb_indices, trend_figure
+from ledger_store import LedgerStore
+from memo import LruCache
+from profiling import Profiler
+from report_engine import period_payload
+from sales_data import (DailyIndex, build_snapshot, goal_progress, monthly_panel_series,
+                        quarter_months, quarter_of_date, records_frame)
+from sheet_sync import (SCOPES, SHEET_NAME_DATA, SHEET_NAME_TARGET, LedgerSync, RequestBudget,
+                        SnapshotRefresher, a1, batch_reader, call_api)
+from snapshot_store import load_snapshot, save_snapshot
+from vendors import DEFAULT_GROUPS, VendorRegistry, groups_from_values
 
 # ===============================
-# 구글시트 연동 (Secrets 우선)
-# ===============================
-SHEET_NAME_DATA = "시트1"
-SHEET_NAME_TARGET = "시트2"
-
-scope = ["https://spreadsheets.google.com/feeds",
-         "https://www.googleapis.com/auth/drive"]
-
-def _build_client():
-    if "gcp_service_account" not in st.secrets:
-        st.error("Secrets에 gcp_service_account가 없습니다.")
-        st.stop()
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(
-        st.secrets["gcp_service_account"], scope
-    )
-    return gspread.authorize(creds)
-
-client = _build_client()
-SHEET_ID = st.secrets.get("SHEET_ID", "1y1rEG5iPGRiLo2GUzW4YrcWsv6dHChPBQxH033-9pts")
-
-# ===============================
-# 데이터
-# ===============================
-ws_data = client.open_by_key(SHEET_ID).worksheet(SHEET_NAME_DATA)
-ws_target = client.open_by_key(SHEET_ID).worksheet(SHEET_NAME_TARGET)
-
-df_data = pd.DataFrame(ws_data.get_all_records())
-df_target = pd.DataFrame(ws_target.get_all_records())
-df_data["날짜"] = pd.to_datetime(df_data["날짜"], errors="coerce")
-
-# ===============================
-# 거래처/분야 구성
-#  - 요청: '밀리의서재', '크레마클럽' 추가
-#  - '전체 매출' 순서: 영풍 다음에 두 구독사
-#  - '구독' 탭 신설
-# ===============================
-base_vendors = [
-    "PG사", "예스24", "교보문고", "알라딘", "영풍",
-    "밀리의서재", "크레마클럽"                    # <<< 추가
-]
-subscription_vendors = ["밀리의서재", "크레마클럽"]  # <<< 구독 그룹
-
-vendor_groups = {
-    "전체 매출": base_vendors,
-    "리커버": ["교보 리커버", "예스 리커버", "알라딘 리커버", "영풍(리커버)"],
-    "전자책": ["예스(전자책)", "알라딘(전자)"],
-    "구독": subscription_vendors,                 # <<< 신설 탭
-}
-
-# ===============================
-# 유틸
-# ===============================
-def clean_numeric(df, cols):
-    safe = [c for c in cols if c in df.columns]
-    if not safe:
-        # 안전한 컬럼이 없을 때 빈 DF 반환
-        return pd.DataFrame(index=df.index)
-    out = df[safe].apply(
-        lambda x: pd.to_numeric(
-            x.astype(str).str.replace(",", "").str.strip().replace("", "0"),
-            errors="coerce"
-        ),
-        axis=0
-    ).fillna(0)
-    return out
-
-def sum_for(df, vendors):
-    """요청: 컬럼이 없을 때도 0 처리(테이블에 행을 유지하기 위함)."""
-    nums = clean_numeric(df, vendors)
-    result = {}
-    for v in vendors:
-        result[v] = float(nums[v].sum()) if (not nums.empty and v in nums.columns) else 0.0
-    return result
-
-def highlight_total(row):
-    return ['font-weight: bold' if row['거래처'] == '합계' else '' for _ in row]
-
-def calc_target_sum(vendors, start_date, end_date):
-    months = pd.period_range(start=start_date.strftime("%Y-%m"),
-                             end=end_date.strftime("%Y-%m"), freq="M")
-    target_sum = {v: 0 for v in vendors}
-    if "거래처" not in df_target.columns:
-        return target_sum
-    for month in months:
-        month_key = f"{month.year}-{month.month:02d}"
-        if month_key in df_target.columns:
-            for v in vendors:
-                if v in df_target["거래처"].values:
-                    val = df_target.loc[df_target["거래처"] == v, month_key].values[0]
-                    target_sum[v] += int(str(val).replace(",", "")) if val else 0
-                else:
-                    # 요청: 타겟 시트에 행이 없으면 0
-                    target_sum[v] += 0
-    return target_sum
-
-def target_sum_for_months(vendors, year, month_list):
-    total = 0
-    if "거래처" not in df_target.columns:
-        return 0
-    for m in month_list:
-        key = f"{year}-{m:02d}"
-        if key in df_target.columns:
-            for v in vendors:
-                if v in df_target["거래처"].values:
-                    val = df_target.loc[df_target["거래처"] == v, key].values[0]
-                    total += int(str(val).replace(",", "")) if val else 0
-                else:
-                    total += 0
-    return total
-
-def month_name_kor(m): return f"{m}월"
-
-def unique_key(*parts):
-    raw = "||".join(map(str, parts))
-    return "k_" + hashlib.md5(raw.encode()).hexdigest()[:12]
-
-def last_day_of_month(y, m): return calendar.monthrange(y, m)[1]
-def quarter_of_date(d: date): return (d.month - 1) // 3 + 1
-def quarter_months(q: int): s = 3*(q-1)+1; return [s, s+1, s+2]
-
-# ===============================
-# 페이지 & 스타일
+# 페이지 & 스타일 (데이터보다 먼저 — 새 세션도 바로 화면이 보이도록)
 # ===============================
 st.set_page_config(page_title="부크크 매출 현황", layout="wide")
 st.markdown("""
@@ -174,6 +65,123 @@ h2{margin-top: var(--gap);}
 st.markdown("<h1 class='main-title'>📊 부크크 매출 현황</h1>", unsafe_allow_html=True)
 st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
 
+# ===============================
+# 구글시트 연동 (Secrets 우선)
+# ===============================
+
+def _build_client():
+    if "gcp_service_account" not in st.secrets:
+        st.error("Secrets에 gcp_service_account가 없습니다.")
+        st.stop()
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(
+        st.secrets["gcp_service_account"], SCOPES
+    )
+    return gspread.authorize(creds)
+
+@st.cache_resource(show_spinner=False)
+def get_client():
+    """gspread 클라이언트는 프로세스 전체에서 하나만 만들어 공유."""
+    return _build_client()
+
+SHEET_ID = st.secrets.get("SHEET_ID", "1y1rEG5iPGRiLo2GUzW4YrcWsv6dHChPBQxH033-9pts")
+DATA_TTL_SEC = int(st.secrets.get("DATA_TTL_SEC", 600))   # 시트 스냅샷 유지 시간(초)
+SYNC_OVERLAP_ROWS = int(st.secrets.get("SYNC_OVERLAP_ROWS", 14))        # 증분 조회 시 다시 받는 최근 행 수
+FULL_RESYNC_SEC = int(st.secrets.get("FULL_RESYNC_SEC", 6 * 3600))     # 전체 재동기화 주기(초)
+
+@st.cache_resource(show_spinner=False)
+def get_ledger_sync():
+    """시트1 증분 동기화 상태(세션 간 공유)."""
+    return LedgerSync(overlap_rows=SYNC_OVERLAP_ROWS, full_resync_sec=FULL_RESYNC_SEC)
+
+# ===============================
+# 데이터 (프로세스 공용 스냅샷: 백그라운드 갱신, 세션은 기다리지 않고 읽기만)
+# ===============================
+REFRESH_POLL_SEC = int(st.secrets.get("REFRESH_POLL_SEC", 60))   # 시트 수정 시각 확인 주기(초)
+SNAPSHOT_DIR = st.secrets.get("SNAPSHOT_DIR", str(Path(__file__).parent / ".cache" / "snapshot"))  # 로컬 저장본 위치
+
+VENDOR_SHEET = st.secrets.get("VENDOR_SHEET", "")     # 거래처/분야 구성 시트 탭(분야 | 거래처), 비우면 시크릿/기본값
+VENDOR_GROUPS = dict(st.secrets.get("VENDOR_GROUPS", {})) or DEFAULT_GROUPS   # {분야: [거래처]}, 첫 분야가 기준
+
+LEDGER_DB = st.secrets.get("LEDGER_DB", "")      # 원장 이력 SQLite 파일(시트에서 지운 과거 행 보관), 비우면 사용 안 함
+LEDGER_DB_YEARS = int(st.secrets.get("LEDGER_DB_YEARS", 5))   # DB 이력 중 메모리에 올릴 최근 연도 수(0 = 전체), 그 이전 기간은 DB 구간 조회
+HISTORY_START = date(date.today().year - LEDGER_DB_YEARS + 1, 1, 1) if LEDGER_DB_YEARS > 0 else None
+
+@st.cache_resource(show_spinner=False)
+def get_ledger_store():
+    return LedgerStore(LEDGER_DB)
+
+SHEETS_REQUESTS_PER_MIN = int(st.secrets.get("SHEETS_REQUESTS_PER_MIN", 30))  # 프로세스 전체 시트 API 호출 한도
+
+@st.cache_resource(show_spinner=False)
+def get_request_budget():
+    return RequestBudget(per_minute=SHEETS_REQUESTS_PER_MIN)
+
+@st.cache_resource(show_spinner=False)
+def get_refresher():
+    client, ledger_sync, budget = get_client(), get_ledger_sync(), get_request_budget()
+    opened = {}
+
+    def spreadsheet():
+        # 오프라인 시작을 위해 시트 열기도 첫 조회 때로 미룸
+        if "sh" not in opened:
+            opened["sh"] = call_api(lambda: client.open_by_key(SHEET_ID), budget)
+        return opened["sh"]
+
+    def fetch():
+        # 시트1(증분 범위) + 시트2 (+ 구성 탭) 을 한 번의 batch 요청으로
+        refresher.stage = "구글시트 조회"
+        extra = [a1(SHEET_NAME_TARGET)] + ([a1(VENDOR_SHEET)] if VENDOR_SHEET else [])
+        raw, (target_values, *vendor_values) = ledger_sync.sync(batch_reader(spreadsheet(), budget),
+                                                                SHEET_NAME_DATA, extra)
+        refresher.stage = "데이터 변환"
+        snap = build_snapshot(raw, records_frame(target_values),
+                              vendor_groups=groups_from_values(vendor_values[0]) if vendor_values else None)
+        if LEDGER_DB:
+            # 시트의 날짜만 DB 에 덮어쓰고, 보관 이력 중 최근 LEDGER_DB_YEARS 년만 일별 프레임으로 분석
+            store = get_ledger_store()
+            store.merge(snap.df_data)
+            history = store.daily_frame(columns=snap.df_data.columns, start=HISTORY_START)
+            snap = snap._replace(df_data=history, daily_index=DailyIndex(history),
+                                 monthly=store.monthly_totals())   # 같은 merge 결과로 함께 공개
+        refresher.stage = "로컬 저장"
+        try:
+            save_snapshot(snap, SNAPSHOT_DIR)
+        except Exception:
+            # 서비스는 계속(다음 조회 때 다시 시도)하되, 오프라인 시작이 안 되는 이유는 남김
+            logging.getLogger(__name__).warning("로컬 스냅샷 저장 실패: %s", SNAPSHOT_DIR, exc_info=True)
+        return snap
+
+    refresher = SnapshotRefresher(fetch, max_age_sec=DATA_TTL_SEC, poll_sec=REFRESH_POLL_SEC,
+                                  probe=lambda: call_api(spreadsheet().get_lastUpdateTime, budget),
+                                  initial=load_snapshot(SNAPSHOT_DIR))
+    return refresher.start()
+
+def cb_refresh_data():
+    # 수동 새로고침은 과거 행 수정까지 반영하도록 전체 재동기화(화면을 그린 뒤 진행 표시와 함께 기다림)
+    # 이미 돌고 있는 (증분으로 계획된) 조회에 합류하지 않도록 fresh — 끝난 뒤 전체 조회를 한 번 더
+    get_ledger_sync().request_full()
+    get_refresher().refresh(fresh=True)
+    st.session_state.await_refresh = True
+
+# 구간 계측: ?profile=1 (시간) 또는 PROFILE 시크릿. 메모리 할당(mem)은 프로세스 전체를 느리게 하므로 시크릿으로만
+PROFILE_SECRET = str(st.secrets.get("PROFILE", "")).lower()
+PROFILE = PROFILE_SECRET or ("1" if str(st.query_params.get("profile", "")).lower() in ("1", "true") else "")
+prof = Profiler(enabled=PROFILE in ("1", "true", "mem"), trace_alloc=PROFILE_SECRET == "mem")
+
+# 첫 조회는 바로 뒤에서 시작하고, 기간 선택 등 데이터와 무관한 화면을 먼저 그린다
+get_refresher().get(wait=False)
+
+# ===============================
+# 유틸
+# ===============================
+def highlight_total(row):
+    return ['font-weight: bold' if row['거래처'] == '합계' else '' for _ in row]
+
+def unique_key(*parts):
+    raw = "||".join(map(str, parts))
+    return "k_" + hashlib.md5(raw.encode()).hexdigest()[:12]
+
+
 # ===============================
 # 기간 선택 (안정화 + 버튼 콜백: 어제 기준)
 # ===============================
@@ -224,17 +232,52 @@ with right:
     st.button("최근 한달",  use_container_width=True, on_click=cb_recent_month,   key="btn_m")
     st.button("최근 분기",  use_container_width=True, on_click=cb_recent_quarter, key="btn_q")
     st.button("최근 1년",  use_container_width=True, on_click=cb_recent_year,    key="btn_y")
+    st.button("새로고침",  use_container_width=True, on_click=cb_refresh_data,   key="btn_refresh")
 
 start_date = st.session_state.applied_start
 end_date   = st.session_state.applied_end
-st.caption(f"적용된 기간: {pd.to_datetime(start_date).strftime('%Y년 %m월 %d일')} ~ {pd.to_datetime(end_date).strftime('%Y년 %m월 %d일')}")
-st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
 
 # ===============================
-# 필터링
+# 데이터 (첫 로드/수동 새로고침만 자리표시자 + 진행 표시와 함께 기다림)
 # ===============================
-df_period = df_data[(df_data["날짜"] >= pd.to_datetime(start_date)) &
-                    (df_data["날짜"] <= pd.to_datetime(end_date))].copy()
+EXPECTED_LOAD_SEC = float(st.secrets.get("EXPECTED_LOAD_SEC", 5))   # 첫 조회 예상 시간(진행 표시용)
+
+def wait_for_data(refresher):
+    """조회가 끝날 때까지 카드 자리표시자와 진행 막대(경과 시간 기준 추정)를 보여줌."""
+    slot = st.empty()
+    with slot.container():
+        bar = st.progress(0.0, text="데이터를 불러오는 중…")
+        for c, label in zip(st.columns(5), ["목표 매출", "전년 매출", "실제 매출", "달성률", "YoY"]):
+            c.markdown(f"<div class='card'><h4>{label}</h4><div class='value small-muted'>…</div></div>",
+                       unsafe_allow_html=True)
+    started = time.monotonic()
+    expected = max(refresher.last_fetch_sec or EXPECTED_LOAD_SEC, 0.5)
+    while not refresher.wait(0.2):
+        elapsed = time.monotonic() - started
+        bar.progress(min(0.95, elapsed / expected * 0.9),
+                     text=f"데이터를 불러오는 중… {refresher.stage} ({elapsed:,.1f}초)")
+    slot.empty()
+
+with prof.section("data_load"):
+    refresher = get_refresher()
+    if st.session_state.pop("await_refresh", False) or refresher.snapshot is None:
+        wait_for_data(refresher)
+    # 첫 조회가 실패했으면 여기서 다시 조회하지 않음(장애/429 중 요청을 늘리지 않도록, 다음 방문 때 재시도)
+    snapshot = refresher.snapshot
+    if snapshot is None:
+        st.error(f"구글시트에서 데이터를 불러오지 못했습니다. ({refresher.last_error})")
+        st.stop()
+df_data, daily_index, target_matrix, loaded_at = (snapshot.df_data, snapshot.daily_index,
+                                                  snapshot.target_matrix, snapshot.loaded_at)
+registry = VendorRegistry(snapshot.vendor_groups or VENDOR_GROUPS)   # 탭/패널/분야 합계의 기준
+vendor_groups = registry.groups
+st.caption(f"적용된 기간: {pd.to_datetime(start_date).strftime('%Y년 %m월 %d일')} ~ {pd.to_datetime(end_date).strftime('%Y년 %m월 %d일')}"
+           f" · 데이터 기준: {loaded_at.strftime('%Y-%m-%d %H:%M:%S')}")
+if get_refresher().last_error is not None:
+    st.warning(f"시트 갱신 실패 — 마지막으로 불러온 데이터를 표시합니다. ({get_refresher().last_error})")
+elif snapshot.source == "disk":
+    st.info("로컬 저장본을 표시 중입니다. 구글시트와 동기화가 끝나면 최신 데이터로 바뀝니다.")
+st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
 
 # ===============================
 # 상단 KPI 카드 공통 렌더러
@@ -255,57 +298,98 @@ def render_top_cards(total_target, total_prev, total_actual):
         st.markdown(f"<div class='card'><h4>YoY</h4><div class='value'>{yoy}</div></div>", unsafe_allow_html=True)
 
 
+# ===============================
+# 탭 공통 계산 (스냅샷 버전 + 기준일로 메모이즈, 탭마다 재계산하지 않음)
+# ===============================
+data_version = snapshot.version
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def goal_summary(_daily_index, _target_matrix, data_version, base, vendors_all):
+    """연/분기/월 (실제, 목표, 경과율%) — 어제 기준, 전체 거래처 합."""
+    return goal_progress(_daily_index, _target_matrix, base, vendors_all)
+
+# 요청: 거래처 개별 + 분야별 (레지스트리에서 생성)
+panels = registry.panels()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def monthly_panels(_df, _monthly, data_version, ref_today, panels):
+    """최근 3개 연도 × 12개월 패널별 시리즈. (연, 월) groupby 한 번(또는 DB 월별 집계)으로 전체 거래처 집계."""
+    return monthly_panel_series(_df, ref_today, panels, monthly=_monthly)
+
+# 로컬 저장본에는 월별 집계가 없고 df_data 는 최근 LEDGER_DB_YEARS 년뿐이므로, DB 가 있으면 그 월별 집계로
+monthly = snapshot.monthly if snapshot.monthly is not None or not LEDGER_DB else get_ledger_store().monthly_totals()
+
+with prof.section("tab_common"):
+    goal = goal_summary(daily_index, target_matrix, data_version, yesterday, tuple(registry.base_vendors))
+    trend_years, trend_series = monthly_panels(df_data, monthly, data_version, today,
+                                               tuple((t, tuple(c)) for t, c in panels))
+
 # ===============================
 # 탭
 # ===============================
-tabs = st.tabs(list(vendor_groups.keys()))
-
-for tab_name, tab in zip(vendor_groups.keys(), tabs):
-    with tab:
-        st.subheader(f"📊 {tab_name}")
-
-        vendors = vendor_groups[tab_name]
-
-        # 실제(기간) / 전년 동기간(기간) — 컬럼이 없어도 0 처리
-        sdt = pd.to_datetime(start_date)
-        edt = pd.to_datetime(end_date)
-
-        actual_sum = sum_for(df_period, vendors)
-
-        ly_s = sdt.replace(year=sdt.year-1); ly_e = edt.replace(year=edt.year-1)
-        df_ly = df_data[(df_data["날짜"] >= ly_s) & (df_data["날짜"] <= ly_e)]
-        prev_sum = sum_for(df_ly, vendors)
-
-        # 목표(기간 월 합)
-        target_sum = calc_target_sum(vendors, sdt, edt)
-
-        # 상단 KPI 카드 (탭별)
-        T = sum(target_sum.values()); P = sum(prev_sum.values()); A = sum(actual_sum.values())
-        render_top_cards(T, P, A)
-
-        # 카드-표 간격
-        st.markdown("<div class='kpi-table-gap'></div>", unsafe_allow_html=True)
-
-        # 표(요청: 컬럼 없어도 행을 보이게, 모두 vendors 기준으로 생성)
-        rows = []
-        for v in vendors:
-            a = actual_sum.get(v, 0); p = prev_sum.get(v, 0); t = target_sum.get(v, 0)
-            achieve = f"{(a/t*100):.1f}%" if t>0 else "-"
-            yoy     = f"{((a-p)/p*100):.1f}%" if p>0 else "-"
-            rows.append({"거래처":v,"목표 매출":f"{t:,.0f} 원","전년 매출":f"{p:,.0f} 원","실제 매출":f"{a:,.0f} 원","달성률":achieve,"YoY":yoy})
-
-        rows.append({"거래처":"합계","목표 매출":f"{T:,.0f} 원","전년 매출":f"{P:,.0f} 원","실제 매출":f"{A:,.0f} 원",
-                     "달성률":f"{(A/T*100):.1f}%" if T>0 else "-",
-                     "YoY":f"{((A-P)/P*100):.1f}%" if P>0 else "-"})
-        st.dataframe(
-            pd.DataFrame(rows).style
-                .set_properties(**{"text-align":"right"}, subset=["목표 매출","전년 매출","실제 매출"])
-                .apply(highlight_total, axis=1),
-            use_container_width=True
-        )
+LAZY_TABS = str(st.secrets.get("LAZY_TABS", "true")).lower() != "false"   # 선택한 탭만 계산/렌더
+DAILY_MAX_POINTS = int(st.secrets.get("DAILY_MAX_POINTS", 400))          # 일일 추이 계열당 최대 점 수
+YOY_YEARS = int(st.secrets.get("YOY_YEARS", 1))                          # 일일 추이 비교 연도 수
+YOY_ALIGN = st.secrets.get("YOY_ALIGN", "weekday")                       # "weekday"(동요일) | "date"(동일자)
+YOY_ALIGN_LABEL = "동요일" if YOY_ALIGN == "weekday" else "동일자"
+
+FIGURE_CACHE_SIZE = int(st.secrets.get("FIGURE_CACHE_SIZE", 256))      # 그림 캐시 최대 개수(LRU)
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """도넛/월별 소형 차트 Figure 캐시(세션 간 공유)."""
+    return LruCache(max_entries=FIGURE_CACHE_SIZE)
+
+REPORT_CACHE_SIZE = int(st.secrets.get("REPORT_CACHE_SIZE", 128))     # 기간×분야 계산 결과 캐시 최대 개수(LRU)
+
+@st.cache_resource(show_spinner=False)
+def get_report_cache():
+    """(데이터 버전, 시작, 끝, 분야) → 표/일일 추이 계산 결과 캐시(세션 간 공유)."""
+    return LruCache(max_entries=REPORT_CACHE_SIZE)
+
+def period_snapshot(start, end):
+    """기간(+ 비교 연도)이 메모리 이력보다 앞이면, DB 에서 그 구간만 읽어 만든 누적합으로 바꾼 스냅샷."""
+    lo = pd.Timestamp(start) - pd.DateOffset(years=max(YOY_YEARS, 1)) - pd.Timedelta(days=7)   # 동요일 정렬 여유
+    if not LEDGER_DB or HISTORY_START is None or lo >= pd.Timestamp(HISTORY_START):
+        return snapshot
+    history = get_ledger_store().daily_frame(columns=df_data.columns, start=lo, end=end)
+    return snapshot._replace(daily_index=DailyIndex(history))
+
+def render_tab(tab_name, prof):
+    prof.start(f"{tab_name}/kpi_table")
+    st.subheader(f"📊 {tab_name}")
+
+    vendors = vendor_groups[tab_name]
+
+    # 실제(기간) / 전년 동기간(기간) / 목표(기간 월 합) — 컬럼이 없어도 0 처리
+    sdt = pd.to_datetime(start_date)
+    edt = pd.to_datetime(end_date)
+    # 최근에 본 기간이면 캐시에서 바로(데이터가 갱신되면 버전이 바뀌어 다시 계산)
+    payload = get_report_cache().get_or_build(
+        (data_version, sdt, edt, tab_name, YOY_YEARS, YOY_ALIGN),
+        lambda: period_payload(period_snapshot(sdt, edt), sdt, edt, vendors, years_back=YOY_YEARS, align=YOY_ALIGN))
+    report = payload.report
+
+    # 상단 KPI 카드 (탭별)
+    T, P, A = report.iloc[-1][["목표", "전년", "실제"]]
+    render_top_cards(T, P, A)
+
+    # 카드-표 간격
+    st.markdown("<div class='kpi-table-gap'></div>", unsafe_allow_html=True)
+
+    # 표(요청: 컬럼 없어도 행을 보이게, 모두 vendors 기준으로 생성)
+    def pct(x): return "-" if pd.isna(x) else f"{x:.1f}%"
+    rows = [{"거래처":r.거래처,"목표 매출":f"{r.목표:,.0f} 원","전년 매출":f"{r.전년:,.0f} 원","실제 매출":f"{r.실제:,.0f} 원",
+             "달성률":pct(r.달성률),"YoY":pct(r.YoY)} for r in report.itertuples(index=False)]
+    st.dataframe(
+        pd.DataFrame(rows).style
+            .set_properties(**{"text-align":"right"}, subset=["목표 매출","전년 매출","실제 매출"])
+            .apply(highlight_total, axis=1),
+        use_container_width=True
+    )
 
-        # 증감액
-        st.markdown(f"""
+    # 증감액
+    st.markdown(f"""
 <div class="footer-cards">
   <div class="footer-card"><div class="title">전년 대비 증가액</div><div class="val">{A-P:+,.0f} 원</div></div>  
   <div class="footer-card"><div class="title">목표 대비 증가액</div><div class="val">{A-T:+,.0f} 원</div></div>  
@@ -313,192 +397,157 @@ for tab_name, tab in zip(vendor_groups.keys(), tabs):
 """, unsafe_allow_html=True)
 
 
-        # =======================
-        # 🎯 목표 달성율 (어제 기준)
-        # =======================
-        st.markdown("### 🎯 목표 달성율")
-
-        base = yesterday
-        vendors_all = base_vendors  # 연/분기/월 총합은 전체 거래처 기준
-
-        y_start = date(base.year, 1, 1)
-        q = quarter_of_date(base); qms = quarter_months(q); q_start = date(base.year, qms[0], 1)
-        m_start = date(base.year, base.month, 1)
-
-        def actual_sum_in_range(d1: date, d2: date):
-            if d2 < d1: return 0
-            m = (df_data["날짜"] >= pd.to_datetime(d1)) & (df_data["날짜"] <= pd.to_datetime(d2))
-            return clean_numeric(df_data.loc[m], [c for c in vendors_all if c in df_data.columns])\
-                        .sum(axis=1).sum()
-
-        actual_y = actual_sum_in_range(y_start, base)
-        actual_q = actual_sum_in_range(q_start, base)
-        actual_m = actual_sum_in_range(m_start, base)
-
-        target_y = target_sum_for_months(vendors_all, base.year, list(range(1,13)))
-        target_q = target_sum_for_months(vendors_all, base.year, qms)
-        target_m = target_sum_for_months(vendors_all, base.year, [base.month])
-
-        y_days = (date(base.year+1,1,1) - y_start).days
-        y_elapsed = (base - y_start).days + 1
-        y_pct = y_elapsed / y_days * 100
-
-        q_end = date(base.year, qms[-1], last_day_of_month(base.year, qms[-1]))
-        q_days = (q_end - q_start).days + 1
-        q_elapsed = (min(base, q_end) - q_start).days + 1
-        q_pct = q_elapsed / q_days * 100
-
-        m_end = date(base.year, base.month, last_day_of_month(base.year, base.month))
-        m_days = (m_end - m_start).days + 1
-        m_elapsed = (min(base, m_end) - m_start).days + 1
-        m_pct = m_elapsed / m_days * 100
-
-        def donut(title, actual, target, key_tag, scope):
-            ratio = (actual/target) if target>0 else 0.0
-            filled = min(max(ratio,0),1.0)
-            fig = go.Figure(data=[go.Pie(values=[filled, 1-filled], hole=0.72,
-                                         sort=False, direction="clockwise",
-                                         textinfo="none", hoverinfo="skip",
-                                         marker=dict(colors=["#3b82f6" if ratio<1 else "#22c55e", "#e5e7eb"]))])
-            fig.update_layout(
-                title=dict(text=title, x=0.5, y=0.93),
-                annotations=[dict(text=f"{ratio*100:.1f}%", x=0.5,y=0.5,showarrow=False,font=dict(size=22,color="#111827")),
-                             dict(text="to Goal", x=0.5,y=0.40,showarrow=False,font=dict(size=12,color="#6b7280"))],
-                showlegend=False, margin=dict(l=10,r=10,t=40,b=10), height=260
-            )
-            st.plotly_chart(fig, use_container_width=True,
-                            key=unique_key("goal", scope, key_tag, title))
-            delta = target - actual
-            cls = "delta-pos" if delta > 0 else ("delta-neg" if delta < 0 else "")
-            st.markdown(
-                f"<div class='small-muted'>목표 {target:,.0f} 원 · 실제 {actual:,.0f} 원<br>"
-                f"<span class='delta {cls}'>차액(목표-실제) {abs(delta):,.0f} 원</span></div>",
-                unsafe_allow_html=True
-            )
-            return ratio*100
-
-        c1,c2,c3 = st.columns(3)
-        with c1: y_ratio = donut("연도 달성율", actual_y, target_y, "y", tab_name)
-        with c2: q_ratio = donut("분기 달성율", actual_q, target_q, "q", tab_name)
-        with c3: m_ratio = donut("월 달성율",   actual_m, target_m, "m", tab_name)
-
-        st.markdown(f"""
-        <div class="kpi-bar" style="margin-top:8px;">
-          <div class="kpi-pill">
-            <div class="label">연도 경과율(어제)</div>
-            <div class="num">{y_pct:.1f}%</div>
-            <div class="small-muted">달성-경과: {(y_ratio - y_pct):+.1f}%p</div>
-          </div>
-          <div class="kpi-pill">
-            <div class="label">분기 경과율(어제)</div>
-            <div class="num">{q_pct:.1f}%</div>
-            <div class="small-muted">달성-경과: {(q_ratio - q_pct):+.1f}%p</div>
-          </div>
-          <div class="kpi-pill">
-            <div class="label">월 경과율(어제)</div>
-            <div class="num">{m_pct:.1f}%</div>
-            <div class="small-muted">달성-경과: {(m_ratio - m_pct):+.1f}%p</div>
-          </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
-
-        # =======================
-        # 일일 매출 추이 (동요일 보정)
-        # =======================
-        st.markdown("### 📈 일일 매출 추이 (올해 vs 작년, 동요일 기준)")
-        safe_cols = [c for c in vendors if c in df_period.columns]
-        daily_cur = df_period[["날짜"] + safe_cols].copy()
-        daily_cur[safe_cols] = clean_numeric(daily_cur, safe_cols)
-        daily_cur["합계"] = daily_cur[safe_cols].sum(axis=1)
-
-        wd_diff = (sdt.weekday() - sdt.replace(year=sdt.year - 1).weekday())
-        ly_start_g = sdt.replace(year=sdt.year - 1) + timedelta(days=wd_diff)
-        ly_end_g   = ly_start_g + (edt - sdt)
-        df_ly_g = df_data[(df_data["날짜"] >= ly_start_g) & (df_data["날짜"] <= ly_end_g)].copy()
-
-        daily_ly = df_ly_g[["날짜"] + safe_cols].copy()
-        daily_ly[safe_cols] = clean_numeric(daily_ly, safe_cols)
-        daily_ly["합계"] = daily_ly[safe_cols].sum(axis=1)
-
-        n = min(len(daily_cur), len(daily_ly))
-        df_chart = pd.DataFrame({
-            "날짜": pd.concat([daily_cur["날짜"].iloc[:n].reset_index(drop=True),
-                              daily_cur["날짜"].iloc[:n].reset_index(drop=True)], ignore_index=True),
-            "매출": pd.concat([daily_cur["합계"].iloc[:n].reset_index(drop=True),
-                              daily_ly["합계"].iloc[:n].reset_index(drop=True)], ignore_index=True),
-            "구분": ["올해"]*n + ["작년(동요일 보정)"]*n
-        })
-        fig = px.line(df_chart, x="날짜", y="매출", color="구분",
-                      labels={"날짜":"날짜","매출":"매출액(원)","구분":"구분"})
-        fig.update_traces(hovertemplate="날짜=%{x|%Y-%m-%d}<br>매출=%{y:,.0f}원<extra></extra>")
-        st.plotly_chart(fig, use_container_width=True, key=unique_key("daily", tab_name))
-
-        st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
-
-        # =======================
-        # 월별 추이 (최근 3년, 확정된 월만)
-        #  - 요청: '구독(분야)' 그래프 추가
-        # =======================
-        st.markdown("### 📈 거래처별 및 분야별 매출 추이 (월별, 최근 3개 연도)")
-        df_all = df_data.copy()
-        df_all["연"] = df_all["날짜"].dt.year
-        df_all["월"] = df_all["날짜"].dt.month
-
-        this_year = today.year
-        yrs_all = sorted(int(y) for y in df_all["연"].dropna().unique())
-        yrs_clip = [y for y in yrs_all if y <= this_year]
-        years = yrs_clip[-3:] if len(yrs_clip) >= 3 else yrs_clip
-
-        last_day_curr = last_day_of_month(yesterday.year, yesterday.month)
-        confirmed_limit = yesterday.month if yesterday.day == last_day_curr else max(1, yesterday.month-1)
-
-        def monthly_series(cols):
-            cols = [c for c in cols if c in df_all.columns]
-            if not cols:
-                base_s = pd.Series([0.0]*12, index=range(1,13))
-                return {y: base_s.copy() for y in years}
-            nums = clean_numeric(df_all, cols)
-            tmp = pd.concat([df_all[["연","월"]], nums], axis=1)
-            tmp["합"] = nums.sum(axis=1)
-            g = tmp.groupby(["연","월"], as_index=False)["합"].sum()
-            out = {}
-            for y in years:
-                s = pd.Series(0.0, index=range(1,13))
-                if y in g["연"].unique():
-                    sub = g[g["연"]==y].set_index("월")["합"]
-                    s.loc[sub.index] = sub.values
-                if y == yesterday.year:
-                    s.loc[range(confirmed_limit+1, 13)] = np.nan
-                out[y] = s
-            return out
-
-        def render_small(title, series_dict, tname, idx):
-            plot_df = pd.DataFrame({str(y): series_dict[y] for y in years}, index=range(1,13))
-            plot_df.index = [month_name_kor(m) for m in plot_df.index]
-            plot_df = plot_df.reset_index().rename(columns={"index":"월"})
-            mdf = plot_df.melt(id_vars=["월"], var_name="연도", value_name="매출")
-            fig = px.line(mdf, x="월", y="매출", color="연도", markers=True,
-                          title=title,
-                          category_orders={"월":[f"{m}월" for m in range(1,13)]},
-                          labels={"월":"월","매출":"매출액(원)","연도":"연도"})
-            fig.update_traces(hovertemplate="월=%{x}<br>매출=%{y:,.0f}원<extra></extra>")
-            fig.update_layout(height=300, margin=dict(l=10,r=10,t=40,b=10))
-            st.plotly_chart(fig, use_container_width=True,
-                            key=unique_key("trend", tname, title, idx, "-".join(map(str,years))))
-
-        # 요청: 거래처 개별 + 분야(전체/리커버/전자책/구독)
-        vendor_panels = [("합계(거래처)", base_vendors)] + [(v,[v]) for v in base_vendors]
-        field_panels  = [("전체매출(분야)", base_vendors),
-                         ("리커버(분야)", vendor_groups["리커버"]),
-                         ("전자책(분야)", vendor_groups["전자책"]),
-                         ("구독(분야)", subscription_vendors)]  # <<< 추가
-        panels = vendor_panels + field_panels
-
-        for i in range(0, len(panels), 2):
-            cols2 = st.columns(2)
-            for j, (title, cols_list) in enumerate(panels[i:i+2]):
-                with cols2[j]:
-                    series = monthly_series(cols_list)
-                    render_small(title, series, tab_name, i+j)
+    # =======================
+    # 🎯 목표 달성율 (어제 기준)
+    # =======================
+    prof.start(f"{tab_name}/donuts")
+    st.markdown("### 🎯 목표 달성율")
+
+    (actual_y, target_y, y_pct), (actual_q, target_q, q_pct), (actual_m, target_m, m_pct) = \
+        goal["y"], goal["q"], goal["m"]
+
+    def donut(title, actual, target, key_tag, scope):
+        ratio = (actual/target) if target>0 else 0.0
+
+        fig = get_figure_cache().get_or_build(content_key("donut", title, ratio),
+                                              lambda: donut_figure(title, ratio))
+        st.plotly_chart(fig, use_container_width=True,
+                        key=unique_key("goal", scope, key_tag, title))
+        delta = target - actual
+        cls = "delta-pos" if delta > 0 else ("delta-neg" if delta < 0 else "")
+        st.markdown(
+            f"<div class='small-muted'>목표 {target:,.0f} 원 · 실제 {actual:,.0f} 원<br>"
+            f"<span class='delta {cls}'>차액(목표-실제) {abs(delta):,.0f} 원</span></div>",
+            unsafe_allow_html=True
+        )
+        return ratio*100
+
+    c1,c2,c3 = st.columns(3)
+    with c1: y_ratio = donut("연도 달성율", actual_y, target_y, "y", tab_name)
+    with c2: q_ratio = donut("분기 달성율", actual_q, target_q, "q", tab_name)
+    with c3: m_ratio = donut("월 달성율",   actual_m, target_m, "m", tab_name)
+
+    st.markdown(f"""
+    <div class="kpi-bar" style="margin-top:8px;">
+      <div class="kpi-pill">
+        <div class="label">연도 경과율(어제)</div>
+        <div class="num">{y_pct:.1f}%</div>
+        <div class="small-muted">달성-경과: {(y_ratio - y_pct):+.1f}%p</div>
+      </div>
+      <div class="kpi-pill">
+        <div class="label">분기 경과율(어제)</div>
+        <div class="num">{q_pct:.1f}%</div>
+        <div class="small-muted">달성-경과: {(q_ratio - q_pct):+.1f}%p</div>
+      </div>
+      <div class="kpi-pill">
+        <div class="label">월 경과율(어제)</div>
+        <div class="num">{m_pct:.1f}%</div>
+        <div class="small-muted">달성-경과: {(m_ratio - m_pct):+.1f}%p</div>
+      </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
+
+    # =======================
+    # 일일 매출 추이 (동요일 보정)
+    # =======================
+    prof.start(f"{tab_name}/daily_chart")
+    compare = "작년" if YOY_YEARS == 1 else f"최근 {YOY_YEARS}개 연도"
+    st.markdown(f"### 📈 일일 매출 추이 (올해 vs {compare}, {YOY_ALIGN_LABEL} 기준)")
+    # 올해/이전 연도를 한 일자 격자에 정렬(빠진 날은 0, 연도 수와 무관하게 한 번에 조회)
+    yoy = payload.daily
+    n = len(yoy)
+    x = pd.Series(yoy.index)
+    series = [("올해" if k == 0 else f"{'작년' if k == 1 else f'{k}년 전'}({YOY_ALIGN_LABEL} 보정)",
+               yoy[k].reset_index(drop=True)) for k in yoy.columns]
+
+    # 긴 기간: 모양 보존 다운샘플링(LTTB) + WebGL, 토글로 전체 해상도 강제
+    full_res = st.toggle("전체 해상도(모든 날짜 표시)", key=unique_key("daily_full", tab_name))
+    long_range = n > DAILY_MAX_POINTS
+    if long_range and not full_res:
+        x_ns = x.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        picks = [lttb_indices(x_ns, y.to_numpy(), DAILY_MAX_POINTS) for _, y in series]
+        st.caption(f"{n:,}일 → 계열당 {DAILY_MAX_POINTS:,}개 점으로 축약 표시")
+    else:
+        picks = [np.arange(n)] * len(series)
+    df_chart = pd.DataFrame({
+        "날짜": pd.concat([x.iloc[i] for i in picks], ignore_index=True),
+        "매출": pd.concat([y.iloc[i] for (_, y), i in zip(series, picks)], ignore_index=True),
+        "구분": [label for (label, _), i in zip(series, picks) for _ in range(len(i))]
+    })
+    fig = daily_figure(df_chart, webgl=long_range)
+    st.plotly_chart(fig, use_container_width=True, key=unique_key("daily", tab_name))
+
+    st.markdown("<div class='section-gap'></div>", unsafe_allow_html=True)
+
+    # =======================
+    # 월별 추이 (최근 3년, 확정된 월만)
+    #  - 요청: '구독(분야)' 그래프 추가
+    # =======================
+    prof.start(f"{tab_name}/monthly_panels")
+    st.markdown("### 📈 거래처별 및 분야별 매출 추이 (월별, 최근 3개 연도)")
+    years = trend_years
+
+    def render_small(title, series_dict, tname, idx):
+        key = content_key("trend", title, tuple(years), *(series_dict[y] for y in years))
+        fig = get_figure_cache().get_or_build(key, lambda: trend_figure(title, series_dict, years))
+        st.plotly_chart(fig, use_container_width=True,
+                        key=unique_key("trend", tname, title, idx, "-".join(map(str,years))))
+
+    for i in range(0, len(panels), 2):
+        cols2 = st.columns(2)
+        for j, (title, cols_list) in enumerate(panels[i:i+2]):
+            with cols2[j]:
+                series = trend_series[title]
+                render_small(title, series, tab_name, i+j)
+    prof.stop()
+
+
+@st.fragment
+def tab_view():
+    """탭 선택 시 이 영역만 재실행(데이터 로드·기간 선택은 다시 돌지 않음)."""
+    # fragment 만 다시 도는 경우 전체 실행의 계측은 이미 끝났으므로 새로 기록
+    p = prof if not prof.finished else Profiler(enabled=prof.enabled, kind="fragment",
+                                                trace_alloc=prof.trace_alloc)
+    names = list(vendor_groups.keys())
+    if st.session_state.get("active_tab") not in names:
+        st.session_state.active_tab = names[0]
+    st.radio("탭", names, key="active_tab", horizontal=True, label_visibility="collapsed")
+    render_tab(st.session_state.active_tab, p)
+    if p is not prof:
+        p.log(tab=st.session_state.active_tab)
+        with st.expander(f"⏱ 탭 재실행 계측 ({p.total_ms():,.0f} ms)"):
+            st.dataframe(p.frame(), hide_index=True, use_container_width=True)
+
+if LAZY_TABS:
+    tab_view()
+else:
+    for tab_name, tab in zip(vendor_groups.keys(), st.tabs(list(vendor_groups.keys()))):
+        with tab:
+            render_tab(tab_name, prof)
+
+# ===============================
+# 계측 패널 (PROFILE 시크릿 또는 ?profile=1)
+# ===============================
+if prof.enabled:
+    fig_cache, report_cache = get_figure_cache(), get_report_cache()
+    refresher = get_refresher()
+    with st.sidebar:
+        st.markdown("### ⏱ 구간별 계측")
+        st.caption(f"실행 {prof.run_id} · 전체 {prof.total_ms():,.0f} ms")
+        st.dataframe(prof.frame(), hide_index=True, use_container_width=True)
+        mem = prof.memory_mb()
+        st.markdown(
+            f"<div class='small-muted'>"
+            f"시트 조회(마지막): {(refresher.last_fetch_sec or 0)*1000:,.0f} ms<br>"
+            f"원장 {len(df_data):,}행 · 스냅샷 {snapshot.source}<br>"
+            f"그림 캐시: hit {fig_cache.hits:,} / miss {fig_cache.misses:,}<br>"
+            f"기간 결과 캐시: hit {report_cache.hits:,} / miss {report_cache.misses:,} · {len(report_cache):,}개"
+            + (f"<br>추적 메모리: 현재 {mem[0]:,.1f} MB · 최대 {mem[1]:,.1f} MB" if mem else "")
+            + "</div>",
+            unsafe_allow_html=True
+        )
+    prof.log(rows=len(df_data), fetch_ms=round((refresher.last_fetch_sec or 0)*1000, 1),
+             figure_cache_hits=fig_cache.hits, figure_cache_misses=fig_cache.misses,
+             report_cache_hits=report_cache.hits, report_cache_misses=report_cache.misses)
@@ -0,0 +1 @@
+# bench: 합성 원장 + 가짜 gspread 백엔드로 app.py 성능 측정 (python -m bench.run_bench)
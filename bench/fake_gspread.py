@@ -0,0 +1,110 @@
+# bench/fake_gspread.py
+#  - 실제 인증/네트워크 없이 app.py 가 쓰는 gspread 호출을 메모리 데이터로 응답
+#  - 호출 횟수 집계, 호출당 지연(latency_sec)으로 네트워크 비용 흉내
+import time
+from contextlib import contextmanager
+
+import gspread
+from gspread.utils import a1_range_to_grid_range
+from oauth2client.service_account import ServiceAccountCredentials
+
+
+def _trim(row):
+    row = list(row)
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _read(values, a1):
+    """Sheets values API 처럼: 범위만큼 자르고 행 끝 빈 칸/끝 빈 행은 생략."""
+    if not a1:
+        rows = [list(r) for r in values]
+    else:
+        g = a1_range_to_grid_range(a1)
+        rows = [list(r)[g.get("startColumnIndex", 0):g.get("endColumnIndex")]
+                for r in values[g.get("startRowIndex", 0):g.get("endRowIndex")]]
+    rows = [_trim(r) for r in rows]
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def _split(rng):
+    title, _, a1 = rng.partition("!")
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, a1
+
+
+class FakeWorksheet:
+    def __init__(self, backend, title, values):
+        self._backend, self.title, self.values = backend, title, values
+
+    def get_all_values(self, **kw):
+        self._backend._call("get_all_values")
+        w = max((len(r) for r in self.values), default=0)
+        return [(list(r) + [""] * w)[:w] for r in self.values]
+
+    def get_all_records(self, **kw):
+        values = self.get_all_values()
+        return [dict(zip(values[0], r)) for r in values[1:]] if values else []
+
+    def batch_get(self, ranges, **kw):
+        self._backend._call("batch_get")
+        return [_read(self.values, r) for r in ranges]
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend, sheets):
+        self._backend = backend
+        self._sheets = {t: FakeWorksheet(backend, t, v) for t, v in sheets.items()}
+        self.modified = "2000-01-01T00:00:00Z"
+
+    def worksheet(self, title):
+        self._backend._call("worksheet")
+        return self._sheets[title]
+
+    def values_batch_get(self, ranges, params=None):
+        self._backend._call("values_batch_get")
+        out = []
+        for rng in ranges:
+            title, a1 = _split(rng)
+            out.append({"range": rng, "values": _read(self._sheets[title].values, a1)})
+        return {"valueRanges": out}
+
+    def get_lastUpdateTime(self):
+        self._backend._call("get_lastUpdateTime")
+        return self.modified
+
+
+class FakeClient:
+    """gspread.Client 대역. sheets = {시트 이름: 값(첫 행=헤더)}."""
+
+    def __init__(self, sheets, latency_sec=0.0):
+        self.latency_sec = latency_sec
+        self.calls = {}
+        self.spreadsheet = FakeSpreadsheet(self, sheets)
+
+    def _call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+
+    def open_by_key(self, key):
+        self._call("open_by_key")
+        return self.spreadsheet
+
+
+@contextmanager
+def installed(client):
+    """gspread.authorize / 서비스 계정 인증을 client 로 대체(종료 시 복구)."""
+    orig_auth = gspread.authorize
+    orig_creds = ServiceAccountCredentials.__dict__["from_json_keyfile_dict"]
+    gspread.authorize = lambda *a, **k: client
+    ServiceAccountCredentials.from_json_keyfile_dict = classmethod(lambda cls, *a, **k: object())
+    try:
+        yield client
+    finally:
+        gspread.authorize = orig_auth
+        ServiceAccountCredentials.from_json_keyfile_dict = orig_creds
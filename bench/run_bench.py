@@ -0,0 +1,201 @@
+# bench/run_bench.py
+#  - 합성 원장(1/5/10년 등)으로 구간별 + 전체 스크립트 실행 시간을 측정해 JSON 으로 출력
+#
+#   python -m bench.run_bench                      # 기본: 1 5 10년, 결과는 stdout
+#   python -m bench.run_bench --years 1 3 --repeat 3 --out bench.json
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bench.fake_gspread import FakeClient, installed
+from bench.synthetic import KNOWN_VENDORS, make_ledger, make_targets
+from charts import daily_figure, donut_figure, lttb_indices, trend_figure
+from sales_data import (build_snapshot, goal_progress, monthly_panel_series,
+                        quarter_months, quarter_of_date, records_frame)
+from report_engine import aligned_daily, period_payload, period_report, period_table, preset_periods
+from sheet_sync import LedgerSync, a1, batch_reader
+from vendors import DEFAULT_REGISTRY
+
+ROOT = Path(__file__).resolve().parents[1]
+APP = ROOT / "app.py"
+
+BASE_VENDORS = DEFAULT_REGISTRY.base_vendors
+GROUPS = DEFAULT_REGISTRY.groups
+PANELS = tuple((title, tuple(vs)) for title, vs in DEFAULT_REGISTRY.panels())
+
+
+def presets(base):
+    """기간 버튼(최근 한달/분기/1년) → (시작, 끝)."""
+    return {
+        "month": (date(base.year, base.month, 1), base),
+        "quarter": (date(base.year, quarter_months(quarter_of_date(base))[0], 1), base),
+        "year": (date(base.year, 1, 1), base),
+    }
+
+
+def timed(fn, repeat):
+    """fn 을 repeat 번 실행한 ms 통계."""
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3), "n": repeat}
+
+
+def bench_sections(ledger, targets, repeat):
+    """app.py 가 한 번 실행될 때 거치는 계산 구간을 streamlit 없이 측정."""
+    yesterday = date.today() - timedelta(days=1)
+    fake = FakeClient({"시트1": ledger, "시트2": targets})
+    read = batch_reader(fake.spreadsheet)
+
+    def sheet_sync():
+        raw, (target_values,) = LedgerSync().sync(read, "시트1", [a1("시트2")])
+        return raw, records_frame(target_values)
+
+    raw, df_target = sheet_sync()
+    snap = build_snapshot(raw, df_target)
+    df, index, matrix = snap.df_data, snap.daily_index, snap.target_matrix
+    periods = presets(yesterday)
+
+    def reports():
+        for s, e in periods.values():
+            for vendors in GROUPS.values():
+                period_report(snap, s, e, vendors)
+
+    def payloads():
+        # 탭 렌더가 캐시 miss 때 계산하는 것(표 + 일일 추이 정렬)
+        for s, e in periods.values():
+            for vendors in GROUPS.values():
+                period_payload(snap, s, e, vendors)
+
+    def precompute():
+        period_table(snap, preset_periods(yesterday), GROUPS)
+
+    def goal_donuts():
+        goal = goal_progress(index, matrix, yesterday, BASE_VENDORS)
+        for tag, (actual, target, _) in goal.items():
+            donut_figure(tag, actual / target if target else 0.0).to_json()
+
+    def daily_chart():
+        s, e = periods["year"]
+        yoy = aligned_daily(index, s, e, BASE_VENDORS)
+        x = yoy.index.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        parts = []
+        for k, label in ((0, "올해"), (1, "작년")):
+            y = yoy[k].to_numpy()
+            idx = lttb_indices(x, y, 400)
+            parts.append(pd.DataFrame({"날짜": yoy.index[idx], "매출": y[idx], "구분": label}))
+        daily_figure(pd.concat(parts, ignore_index=True), webgl=len(yoy) > 400).to_json()
+
+    def monthly_panels():
+        years, series = monthly_panel_series(df, date.today(), PANELS)
+        for title, _ in PANELS:
+            trend_figure(title, series[title], years).to_json()
+
+    sections = {
+        "sheet_sync": sheet_sync,
+        "ingest": lambda: build_snapshot(raw, df_target),
+        "period_report": reports,
+        "period_payload": payloads,
+        "precompute_all": precompute,
+        "goal_donuts": goal_donuts,
+        "daily_chart": daily_chart,
+        "monthly_panels": monthly_panels,
+    }
+    return {name: timed(fn, repeat) for name, fn in sections.items()}
+
+
+def bench_app(ledger, targets, repeat, lazy_tabs):
+    """AppTest 로 app.py 전체 실행: 최초(cold) / 재실행 / 기간 버튼 클릭."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    results = {"cold_run": [], "rerun": [], "period_switch": []}
+    for _ in range(repeat):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        fake = FakeClient({"시트1": ledger, "시트2": targets})
+        with installed(fake), tempfile.TemporaryDirectory() as snap_dir:
+            at = AppTest.from_file(str(APP), default_timeout=600)
+            at.secrets["gcp_service_account"] = {"type": "service_account"}
+            at.secrets["SNAPSHOT_DIR"] = snap_dir
+            at.secrets["REFRESH_POLL_SEC"] = 3600
+            at.secrets["LAZY_TABS"] = "true" if lazy_tabs else "false"
+            for name, step in (("cold_run", at.run), ("rerun", at.run),
+                               ("period_switch", lambda: at.button(key="btn_y").click().run())):
+                t = time.perf_counter()
+                step()
+                results[name].append((time.perf_counter() - t) * 1000)
+                if at.exception:
+                    raise RuntimeError(at.exception[0].message)
+    return {k: {"median_ms": round(statistics.median(v), 3), "min_ms": round(min(v), 3),
+                "max_ms": round(max(v), 3), "n": len(v)} for k, v in results.items()}
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="부크크 매출 대시보드 벤치마크")
+    p.add_argument("--years", type=int, nargs="+", default=[1, 5, 10], help="원장 길이(연)")
+    p.add_argument("--vendors", type=int, default=len(KNOWN_VENDORS), help="거래처 컬럼 수")
+    p.add_argument("--missing-rate", type=float, default=0.03, help="빈 칸 비율")
+    p.add_argument("--comma-rate", type=float, default=0.9, help="'1,234' 형식 비율")
+    p.add_argument("--repeat", type=int, default=5, help="구간별 반복 횟수")
+    p.add_argument("--app-repeat", type=int, default=2, help="전체 스크립트 반복 횟수")
+    p.add_argument("--no-app", action="store_true", help="AppTest 전체 실행 생략")
+    p.add_argument("--all-tabs", action="store_true", help="LAZY_TABS=false 로 네 탭 모두 렌더")
+    p.add_argument("--out", help="결과 JSON 파일(기본 stdout)")
+    args = p.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "vendors": args.vendors,
+            "missing_rate": args.missing_rate,
+            "comma_rate": args.comma_rate,
+            "lazy_tabs": not args.all_tabs,
+        },
+        "results": [],
+    }
+    for years in args.years:
+        ledger = make_ledger(years, args.vendors, missing_rate=args.missing_rate,
+                             comma_rate=args.comma_rate)
+        targets = make_targets(years, args.vendors)
+        entry = {"years": years, "rows": len(ledger) - 1,
+                 "sections": bench_sections(ledger, targets, args.repeat)}
+        if not args.no_app:
+            entry["app"] = bench_app(ledger, targets, args.app_repeat, lazy_tabs=not args.all_tabs)
+        report["results"].append(entry)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# bench/synthetic.py
+#  - 시트1(일별 원장)/시트2(월 목표) 모양의 합성 데이터 생성
+import random
+from datetime import date, timedelta
+
+# app.py 가 실제로 읽는 거래처 컬럼(앞쪽) — 나머지는 거래처NN 으로 채움
+KNOWN_VENDORS = [
+    "PG사", "예스24", "교보문고", "알라딘", "영풍", "밀리의서재", "크레마클럽",
+    "교보 리커버", "예스 리커버", "알라딘 리커버", "영풍(리커버)", "예스(전자책)", "알라딘(전자)",
+]
+
+
+def vendor_names(n_vendors):
+    extra = [f"거래처{i:02d}" for i in range(1, max(0, n_vendors - len(KNOWN_VENDORS)) + 1)]
+    return (KNOWN_VENDORS + extra)[:n_vendors]
+
+
+def make_ledger(years, n_vendors=len(KNOWN_VENDORS), end=None, missing_rate=0.03,
+                comma_rate=0.9, seed=0):
+    """시트1 값(첫 행=헤더). end(기본 어제)까지 years 개 연도, 하루 한 행.
+
+    missing_rate 만큼 빈 칸, comma_rate 만큼 '1,234' 형식, 나머지는 '1234'.
+    """
+    rnd = random.Random(seed)
+    end = end or date.today() - timedelta(days=1)
+    vendors = vendor_names(n_vendors)
+    values = [["날짜"] + vendors]
+    d = date(end.year - years + 1, 1, 1)
+    while d <= end:
+        row = [d.strftime("%Y-%m-%d")]
+        for _ in vendors:
+            if rnd.random() < missing_rate:
+                row.append("")
+                continue
+            x = rnd.randint(0, 900_000)
+            row.append(f"{x:,}" if rnd.random() < comma_rate else str(x))
+        values.append(row)
+        d += timedelta(days=1)
+    return values
+
+
+def make_targets(years, n_vendors=len(KNOWN_VENDORS), end=None, seed=0):
+    """시트2 값: 거래처 × 'YYYY-MM' 목표(올해 말까지)."""
+    rnd = random.Random(seed + 1)
+    end = end or date.today() - timedelta(days=1)
+    months = [f"{y}-{m:02d}" for y in range(end.year - years + 1, end.year + 1) for m in range(1, 13)]
+    values = [["거래처"] + months]
+    for v in vendor_names(n_vendors):
+        values.append([v] + [f"{rnd.randint(1, 30) * 1_000_000:,}" for _ in months])
+    return values
@@ -0,0 +1,97 @@
+# charts.py
+#  - 차트 공통 보조 함수 (다운샘플링, 그림 캐시 키 등)
+import hashlib
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: 모양을 보존하며 threshold 개 점의 인덱스를 고른다.
+
+    x 는 단조 증가하는 수치(예: 날짜의 ns 값), y 는 같은 길이의 값.
+    점 수가 threshold 이하이거나 threshold < 3 이면 전체 인덱스를 돌려준다.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+
+    # 첫/마지막 점은 고정, 가운데를 threshold-2 개 구간으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 구간 평균점(마지막 구간이면 끝점)
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def content_key(*parts):
+    """입력 값(수치 배열/Series 포함) + 레이아웃 파라미터로 만든 내용 해시."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        if isinstance(p, (pd.Series, pd.DataFrame)):
+            p = p.to_numpy()
+        if isinstance(p, np.ndarray):
+            h.update(str(p.dtype).encode())
+            h.update(np.ascontiguousarray(p).tobytes())
+        else:
+            h.update(repr(p).encode())
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+# ===============================
+# 그림 생성(입력이 같으면 결과도 같으므로 content_key + LruCache 로 재사용 가능)
+# ===============================
+def month_name_kor(m): return f"{m}월"
+
+
+def donut_figure(title, ratio):
+    """목표 달성율 도넛. ratio = 실제/목표(1 이상이면 초록)."""
+    filled = min(max(ratio,0),1.0)
+    fig = go.Figure(data=[go.Pie(values=[filled, 1-filled], hole=0.72,
+                                 sort=False, direction="clockwise",
+                                 textinfo="none", hoverinfo="skip",
+                                 marker=dict(colors=["#3b82f6" if ratio<1 else "#22c55e", "#e5e7eb"]))])
+    fig.update_layout(
+        title=dict(text=title, x=0.5, y=0.93),
+        annotations=[dict(text=f"{ratio*100:.1f}%", x=0.5,y=0.5,showarrow=False,font=dict(size=22,color="#111827")),
+                     dict(text="to Goal", x=0.5,y=0.40,showarrow=False,font=dict(size=12,color="#6b7280"))],
+        showlegend=False, margin=dict(l=10,r=10,t=40,b=10), height=260
+    )
+    return fig
+
+
+def trend_figure(title, series_dict, years):
+    """월별 추이 소형 차트(연도별 12개월 선)."""
+    plot_df = pd.DataFrame({str(y): series_dict[y] for y in years}, index=range(1,13))
+    plot_df.index = [month_name_kor(m) for m in plot_df.index]
+    plot_df = plot_df.reset_index().rename(columns={"index":"월"})
+    mdf = plot_df.melt(id_vars=["월"], var_name="연도", value_name="매출")
+    fig = px.line(mdf, x="월", y="매출", color="연도", markers=True,
+                  title=title,
+                  category_orders={"월":[f"{m}월" for m in range(1,13)]},
+                  labels={"월":"월","매출":"매출액(원)","연도":"연도"})
+    fig.update_traces(hovertemplate="월=%{x}<br>매출=%{y:,.0f}원<extra></extra>")
+    fig.update_layout(height=300, margin=dict(l=10,r=10,t=40,b=10))
+    return fig
+
+
+def daily_figure(df_chart, webgl=False):
+    """일일 매출 추이(날짜/매출/구분 long 포맷)."""
+    fig = px.line(df_chart, x="날짜", y="매출", color="구분",
+                  render_mode="webgl" if webgl else "auto",
+                  labels={"날짜":"날짜","매출":"매출액(원)","구분":"구분"})
+    fig.update_traces(hovertemplate="날짜=%{x|%Y-%m-%d}<br>매출=%{y:,.0f}원<extra></extra>")
+    return fig
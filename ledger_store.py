@@ -0,0 +1,89 @@
+# ledger_store.py
+#  - (선택) 시트1 원장을 로컬 SQLite 에 누적 보관: (날짜, 거래처) 인덱스 + 월별 사전 집계 테이블
+#  - 시트에 있는 날짜만 덮어쓰므로, 시트에서 지운(보관 처리한) 과거 행도 DB 에 남는다
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from sales_data import DATE_COL
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    day    TEXT    NOT NULL,            -- 'YYYY-MM-DD'
+    vendor TEXT    NOT NULL,
+    amount INTEGER NOT NULL,
+    PRIMARY KEY (day, vendor)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS monthly (
+    month  TEXT    NOT NULL,            -- 'YYYY-MM'
+    vendor TEXT    NOT NULL,
+    amount INTEGER NOT NULL,
+    PRIMARY KEY (month, vendor)
+) WITHOUT ROWID;
+"""
+
+
+class LedgerStore:
+    """일자 × 거래처 매출 이력(0 은 저장하지 않음). 연결은 호출마다 열고 닫아 스레드 간 공유 가능."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")     # 갱신 중에도 읽기 가능
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def merge(self, df):
+        """ingest 된 원장 프레임에 있는 날짜들만 교체하고 해당 월 집계를 다시 계산.
+
+        시트의 [첫 날, 마지막 날] 구간 전체를 지우지 않는다 — 날짜 오타 한 행(예: 2002년)이
+        그 사이의 보관 이력을 모두 지우지 않도록.
+        """
+        vendors = [c for c in df.columns if c != DATE_COL]
+        if df.empty or not vendors:
+            return
+        daily = df[vendors].astype("int64").groupby(df[DATE_COL].dt.strftime("%Y-%m-%d")).sum()
+        months = sorted({d[:7] for d in daily.index})
+        rows = daily.stack()
+        rows = rows[rows != 0]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM daily WHERE day = ?", ((d,) for d in daily.index))
+            conn.executemany("INSERT INTO daily VALUES (?, ?, ?)",
+                             ((d, v, int(a)) for (d, v), a in rows.items()))
+            conn.executemany("DELETE FROM monthly WHERE month = ?", ((m,) for m in months))
+            conn.executemany("INSERT INTO monthly SELECT substr(day, 1, 7), vendor, SUM(amount) FROM daily "
+                             "WHERE day BETWEEN ? AND ? GROUP BY 1, 2", ((m + "-01", m + "-31") for m in months))
+
+    def daily_frame(self, columns=(), start=None, end=None):
+        """저장된 이력 [start, end](없으면 끝까지): 날짜 + 거래처 열 프레임, 하루 한 행.
+
+        (day, vendor) 기본키 범위 조회라 요청 구간만 읽는다. columns 에 있는 거래처를
+        그 순서로 먼저, 나머지(보관 이력에만 있는 거래처)는 이름순.
+        """
+        lo = pd.Timestamp(start).strftime("%Y-%m-%d") if start is not None else "0000-00-00"
+        hi = pd.Timestamp(end).strftime("%Y-%m-%d") if end is not None else "9999-12-31"
+        with closing(self._connect()) as conn:
+            long = pd.read_sql_query("SELECT day, vendor, amount FROM daily WHERE day BETWEEN ? AND ? "
+                                     "ORDER BY day", conn, params=(lo, hi))
+        wide = long.pivot_table(index="day", columns="vendor", values="amount", aggfunc="sum", fill_value=0)
+        first = [c for c in columns if c != DATE_COL]
+        order = first + sorted(c for c in wide.columns if c not in first)
+        wide = wide.reindex(columns=order, fill_value=0).astype("int64")
+        wide.columns.name = None
+        wide.insert(0, DATE_COL, pd.to_datetime(wide.index, format="%Y-%m-%d"))
+        return wide.reset_index(drop=True)
+
+    def monthly_totals(self):
+        """월별 사전 집계 → (연, 월) × 거래처 프레임(monthly_panel_series 입력)."""
+        with closing(self._connect()) as conn:
+            long = pd.read_sql_query("SELECT month, vendor, amount FROM monthly", conn)
+        wide = long.pivot_table(index="month", columns="vendor", values="amount", aggfunc="sum", fill_value=0)
+        wide.columns.name = None
+        wide.index = pd.MultiIndex.from_arrays(
+            [wide.index.str[:4].astype(int).rename("연"), wide.index.str[5:7].astype(int).rename("월")])
+        return wide.astype("int64")
@@ -0,0 +1,37 @@
+# memo.py
+#  - 프로세스 공유 LRU 캐시(여러 세션/스레드가 함께 사용)
+import threading
+from collections import OrderedDict
+
+
+class LruCache:
+    """키 → 계산 결과의 LRU 캐시. 가장 오래 안 쓴 항목부터 max_entries 를 넘는 만큼 버린다.
+
+    값은 여러 세션이 함께 읽으므로 꺼낸 뒤 수정하지 않는다.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
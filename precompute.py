@@ -0,0 +1,85 @@
+# precompute.py
+#  - 모든 기본 기간(최근 한달/분기/1년 + 최근 3년 각 월) × 분야 리포트를 한 번에 계산해 파일로 저장
+#
+#   python precompute.py                                        # 로컬 스냅샷(.cache/snapshot) 사용
+#   python precompute.py --credentials key.json --sheet-id <ID>  # 구글시트에서 직접 조회
+#   python precompute.py --out-dir reports --format csv --base 2024-06-30
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from report_engine import goal_table, period_table, preset_periods
+from sales_data import build_snapshot, records_frame
+from snapshot_store import load_snapshot
+from vendors import DEFAULT_GROUPS, VendorRegistry, groups_from_values
+
+ROOT = Path(__file__).resolve().parent
+
+
+def fetch_snapshot(keyfile, sheet_id, vendor_sheet=None, requests_per_min=30):
+    """서비스 계정 키 파일로 시트1/시트2(+ 구성 탭)를 한 번의 batch 요청으로 읽어 Snapshot 생성."""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    from sheet_sync import (SCOPES, SHEET_NAME_DATA, SHEET_NAME_TARGET, LedgerSync, RequestBudget,
+                            a1, batch_reader, call_api)
+
+    budget = RequestBudget(per_minute=requests_per_min)
+    client = gspread.authorize(ServiceAccountCredentials.from_json_keyfile_name(keyfile, SCOPES))
+    sh = call_api(lambda: client.open_by_key(sheet_id), budget)
+    extra = [a1(SHEET_NAME_TARGET)] + ([a1(vendor_sheet)] if vendor_sheet else [])
+    raw, (target_values, *vendor_values) = LedgerSync().sync(batch_reader(sh, budget), SHEET_NAME_DATA, extra)
+    return build_snapshot(raw, records_frame(target_values),
+                          vendor_groups=groups_from_values(vendor_values[0]) if vendor_values else None)
+
+
+def write_frame(df, path):
+    if path.suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    elif path.suffix == ".csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")     # 엑셀에서 한글이 깨지지 않도록 BOM
+    else:
+        df.to_json(path, orient="records", force_ascii=False, date_format="iso", indent=1)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="부크크 매출 기본 기간 리포트 일괄 계산")
+    p.add_argument("--snapshot-dir", default=str(ROOT / ".cache" / "snapshot"),
+                   help="로컬 스냅샷 위치(--credentials 가 없을 때)")
+    p.add_argument("--credentials", help="서비스 계정 JSON 키 파일(시트에서 직접 조회)")
+    p.add_argument("--sheet-id", help="구글시트 ID(--credentials 와 함께)")
+    p.add_argument("--vendor-sheet", help="거래처/분야 구성 시트 탭 이름(분야 | 거래처)")
+    p.add_argument("--base", type=date.fromisoformat, default=date.today() - timedelta(days=1),
+                   help="기준일 YYYY-MM-DD(기본: 어제)")
+    p.add_argument("--months-back", type=int, default=36, help="월별 리포트 개월 수")
+    p.add_argument("--out-dir", default=".", help="결과 폴더(periods.*, goals.*)")
+    p.add_argument("--format", choices=["parquet", "csv", "json"], default="parquet")
+    args = p.parse_args(argv)
+
+    if args.credentials:
+        if not args.sheet_id:
+            p.error("--credentials 에는 --sheet-id 가 필요합니다.")
+        snapshot = fetch_snapshot(args.credentials, args.sheet_id, args.vendor_sheet)
+    else:
+        snapshot = load_snapshot(args.snapshot_dir)
+        if snapshot is None:
+            sys.exit(f"스냅샷이 없습니다: {args.snapshot_dir} (--credentials/--sheet-id 로 시트에서 조회)")
+
+    groups = VendorRegistry(snapshot.vendor_groups or DEFAULT_GROUPS).groups
+    periods = period_table(snapshot, preset_periods(args.base, args.months_back), groups)
+    goals = goal_table(snapshot, args.base, groups)
+    for df in (periods, goals):
+        df.insert(0, "데이터 기준", pd.Timestamp(snapshot.loaded_at))
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in (("periods", periods), ("goals", goals)):
+        write_frame(df, out_dir / f"{name}.{args.format}")
+    print(f"{len(periods)} period rows, {len(goals)} goal rows → {out_dir} (data {snapshot.version})")
+
+
+if __name__ == "__main__":
+    main()
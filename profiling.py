@@ -0,0 +1,127 @@
+# profiling.py
+#  - 선택적 구간 계측: 실행 시간 (+ trace_alloc 이면 메모리 할당, tracemalloc)
+#  - 꺼져 있으면 아무 것도 측정하지 않음(오버헤드 없음)
+#  - tracemalloc 은 프로세스 전역 상태이고 전체를 느리게 하므로 한 번에 한 Profiler 만 켜고,
+#    log() 또는 Profiler 가 사라질 때(실행 중단, 프로세스 종료 포함) 반드시 끈다
+import json
+import logging
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger("bookk.profile")
+if not logger.handlers:         # streamlit 은 루트 로거를 WARNING 으로 두므로 직접 출력(stderr, JSON 한 줄)
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_trace_lock = threading.Lock()
+_trace_owner = None             # tracemalloc 을 켠 Profiler 의 run_id
+
+
+def _acquire_tracing(run_id):
+    global _trace_owner
+    with _trace_lock:
+        if _trace_owner is not None or tracemalloc.is_tracing():
+            return False        # 다른 세션이 계측 중 — 피크/할당이 섞이지 않도록 이번 실행은 시간만
+        tracemalloc.start()
+        _trace_owner = run_id
+        return True
+
+
+def _release_tracing(run_id):
+    global _trace_owner
+    with _trace_lock:
+        if _trace_owner == run_id:
+            tracemalloc.stop()
+            _trace_owner = None
+
+
+class Profiler:
+    """한 번의 스크립트(또는 fragment) 실행 동안의 구간별 시간/할당 기록."""
+
+    def __init__(self, enabled=False, kind="full", trace_alloc=False):
+        self.enabled = enabled
+        self.kind = kind
+        self.run_id = uuid.uuid4().hex[:8]
+        self.trace_alloc = enabled and trace_alloc and _acquire_tracing(self.run_id)
+        # 중단(RerunException/st.stop)으로 log() 에 닿지 못해도 GC/종료 시 계측을 끈다
+        self._release = weakref.finalize(self, _release_tracing, self.run_id) if self.trace_alloc else None
+        self.records = []
+        self.finished = False           # log() 이후 True — 이후 fragment 재실행은 새 Profiler 사용
+        self._open = None               # start() 로 열린 구간 (이름, 시작 시각, 시작 메모리)
+        self._t0 = time.perf_counter()
+
+    def _memory(self):
+        return tracemalloc.get_traced_memory() if self.trace_alloc and _trace_owner == self.run_id else (0, 0)
+
+    def _begin(self, name):
+        if self.trace_alloc:
+            tracemalloc.reset_peak()
+        return name, time.perf_counter(), self._memory()[0]
+
+    def _end(self, opened):
+        name, t, mem0 = opened
+        mem1, peak = self._memory()
+        self.records.append({"section": name,
+                             "ms": round((time.perf_counter() - t) * 1000, 2),
+                             "alloc_kb": round((mem1 - mem0) / 1024, 1) if self.trace_alloc else None,
+                             "peak_kb": round((peak - mem0) / 1024, 1) if self.trace_alloc else None})
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        self.stop()
+        opened = self._begin(name)
+        try:
+            yield
+        finally:
+            self._end(opened)
+
+    def start(self, name):
+        """이전 start() 구간을 닫고 새 구간 시작(들여쓰기 없이 순차 구간 표시용)."""
+        if self.enabled:
+            self.stop()
+            self._open = self._begin(name)
+
+    def stop(self):
+        if self.enabled and self._open is not None:
+            self._end(self._open)
+            self._open = None
+
+    def frame(self):
+        return pd.DataFrame(self.records, columns=["section", "ms", "alloc_kb", "peak_kb"])
+
+    def total_ms(self):
+        return round((time.perf_counter() - self._t0) * 1000, 2)
+
+    def memory_mb(self):
+        """(현재, 최대) 추적 메모리 MB. 할당 추적이 꺼져 있으면 None."""
+        if not self.trace_alloc or _trace_owner != self.run_id:
+            return None
+        cur, peak = tracemalloc.get_traced_memory()
+        return cur / 1024 / 1024, peak / 1024 / 1024
+
+    def close(self):
+        """할당 추적을 켰다면 끈다(여러 번 불러도 됨)."""
+        if self._release is not None:
+            self._release()
+
+    def log(self, **extra):
+        """구간별 기록을 JSON 한 줄로 남김(실행 단위)."""
+        self.finished = True
+        if self.enabled:
+            self.stop()
+            self.close()
+            logger.info(json.dumps({"run_id": self.run_id, "kind": self.kind,
+                                    "total_ms": self.total_ms(), "sections": self.records, **extra},
+                                   ensure_ascii=False, default=str))
@@ -0,0 +1,141 @@
+# report_engine.py
+#  - 기간 × 분야(거래처 그룹) 리포트 계산: 목표 / 전년 동기간 / 실제 / 달성률 / YoY
+#  - streamlit 과 무관한 순수 계산 — 대시보드, 배치 CLI(precompute.py), 벤치가 함께 사용
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from sales_data import goal_progress, membership_matrix, quarter_months, quarter_of_date
+
+TOTAL_ROW = "합계"
+AMOUNT_COLS = ["목표", "전년", "실제"]
+GOAL_SCOPES = {"y": "연도", "q": "분기", "m": "월"}
+
+
+def shift_year(d, years=-1):
+    """같은 월/일의 years 년 뒤(음수면 앞) 날짜. 2/29 → 2/28."""
+    d = pd.Timestamp(d)
+    try:
+        return d.replace(year=d.year + years)
+    except ValueError:
+        return d.replace(year=d.year + years, day=28)
+
+
+def preset_periods(base, months_back=36):
+    """기간 버튼(최근 한달/분기/1년) + 최근 months_back 개월 각 월 → [(이름, 시작, 끝)].
+
+    끝은 base(어제)를 넘지 않는다.
+    """
+    base = pd.Timestamp(base).normalize()
+    q_first = quarter_months(quarter_of_date(base))[0]
+    out = [("최근 한달", base.replace(day=1), base),
+           ("최근 분기", base.replace(month=q_first, day=1), base),
+           ("최근 1년", base.replace(month=1, day=1), base)]
+    this_month = base.to_period("M")
+    for p in pd.period_range(this_month - (months_back - 1), this_month, freq="M"):
+        out.append((str(p), p.start_time, min(p.end_time.normalize(), base)))
+    return out
+
+
+def _pick(mat, columns, vendors):
+    """(기간, 전체 열) 행렬에서 vendors 순서의 열만. 없는 거래처는 0 열."""
+    out = np.zeros((mat.shape[0], len(vendors)), dtype=np.int64)
+    for j, v in enumerate(vendors):
+        if v in columns:
+            out[:, j] = mat[:, columns[v]]
+    return out
+
+
+def _with_ratios(df):
+    """달성률/YoY(%) 열 추가. 분모가 0 이면 NaN."""
+    target, prev, actual = (df[c].to_numpy(dtype=np.float64) for c in AMOUNT_COLS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["달성률"] = np.where(target > 0, actual / target * 100, np.nan)
+        df["YoY"] = np.where(prev > 0, (actual - prev) / prev * 100, np.nan)
+    return df
+
+
+def period_table(snapshot, periods, groups):
+    """periods [(이름, 시작, 끝)] × groups {분야: 거래처들} 리포트(long 프레임).
+
+    누적합 인덱스에서 모든 기간을 한 번에 조회하고, 분야마다 거래처 행 뒤에
+    '합계' 행을 붙인다. 열: 기간, 시작, 종료, 분야, 거래처, 목표, 전년, 실제, 달성률, YoY.
+    """
+    idx, tm = snapshot.daily_index, snapshot.target_matrix
+    labels = [p[0] for p in periods]
+    starts = pd.DatetimeIndex([pd.Timestamp(p[1]) for p in periods]).normalize()
+    ends = pd.DatetimeIndex([pd.Timestamp(p[2]) for p in periods]).normalize()
+
+    actual = idx.range_matrix(starts, ends)
+    prev = idx.range_matrix([shift_year(d) for d in starts], [shift_year(d) for d in ends])
+    target = tm.range_matrix(starts.to_period("M"), ends.to_period("M"))
+
+    # 분야 합계는 (기간, 거래처) @ (거래처, 분야) 소속 행렬 곱 한 번으로
+    sources = [(col, mat, columns, mat @ membership_matrix(columns, list(groups.items())))
+               for col, mat, columns in (("목표", target, tm.vendors), ("전년", prev, idx.vendors),
+                                         ("실제", actual, idx.vendors))]
+    parts = []
+    for j, (group, vendors) in enumerate(groups.items()):
+        vendors = list(vendors)
+        names = vendors + [TOTAL_ROW]
+        n = len(names)
+        amounts = {col: np.column_stack([_pick(mat, columns, vendors), totals[:, j]]).ravel()
+                   for col, mat, columns, totals in sources}
+        parts.append(pd.DataFrame({"기간": np.repeat(labels, n), "시작": starts.repeat(n),
+                                   "종료": ends.repeat(n), "분야": group,
+                                   "거래처": np.tile(names, len(periods)), **amounts}))
+    if not parts:
+        return _with_ratios(pd.DataFrame(columns=["기간", "시작", "종료", "분야", "거래처"] + AMOUNT_COLS))
+    return _with_ratios(pd.concat(parts, ignore_index=True))
+
+
+def period_report(snapshot, start, end, vendors):
+    """한 기간 × 한 거래처 목록 리포트: 거래처별 행 + '합계' 행."""
+    table = period_table(snapshot, [("", start, end)], {"": vendors})
+    return table[["거래처"] + AMOUNT_COLS + ["달성률", "YoY"]]
+
+
+def aligned_daily(daily_index, start, end, vendors, years_back=1, align="weekday"):
+    """[start, end] 일별 합계와 이전 years_back 개 연도 같은 구간을 한 일자 격자에 정렬.
+
+    index = 구간의 모든 날짜(데이터 마지막 날까지, 빠진 날은 0), 열 k = k년 전(0 = 현재).
+    align="weekday": k년 전 동일자에 가장 가까운 7일 배수만큼 이동(요일 일치, 구간 내 일정)
+    align="date": k년 전 같은 월/일(2/29 는 2/28)
+    """
+    start = pd.Timestamp(start).normalize()
+    last_day = daily_index.first_day + pd.Timedelta(days=daily_index.n_days - 1)
+    grid = pd.date_range(start, min(pd.Timestamp(end).normalize(), last_day), freq="D", name="날짜")
+    ks = range(years_back + 1)
+    if align == "weekday":
+        weeks = np.array([round((start - shift_year(start, -k)).days / 7) * 7 for k in ks])
+        days = grid.to_numpy(dtype="datetime64[D]")[None, :] - weeks[:, None].astype("timedelta64[D]")
+    elif align == "date":
+        days = np.stack([(grid - pd.DateOffset(years=k)).to_numpy(dtype="datetime64[D]") for k in ks])
+    else:
+        raise ValueError(f"align 은 'weekday' 또는 'date': {align!r}")
+    # 모든 연도를 한 번에 조회 (k, 일) → (일, k)
+    return pd.DataFrame(daily_index.days_total(days, vendors).T, index=grid, columns=list(ks))
+
+
+class PeriodPayload(NamedTuple):
+    """한 (기간, 분야) 화면에 필요한 계산 결과 묶음(캐시 공유, 수정 금지)."""
+    report: pd.DataFrame        # period_report: 거래처별 + 합계
+    daily: pd.DataFrame         # aligned_daily: 일자 × (올해, k년 전)
+
+
+def period_payload(snapshot, start, end, vendors, years_back=1, align="weekday"):
+    return PeriodPayload(period_report(snapshot, start, end, vendors),
+                         aligned_daily(snapshot.daily_index, start, end, vendors, years_back, align))
+
+
+def goal_table(snapshot, base, groups):
+    """분야별 연/분기/월 목표 달성(base=어제 기준) → 분야, 구분, 실제, 목표, 달성률, 경과율."""
+    rows = []
+    for group, vendors in groups.items():
+        goal = goal_progress(snapshot.daily_index, snapshot.target_matrix, base, vendors)
+        for tag, scope in GOAL_SCOPES.items():
+            actual, target, elapsed = goal[tag]
+            rows.append({"분야": group, "구분": scope, "실제": actual, "목표": target,
+                         "달성률": actual / target * 100 if target else np.nan, "경과율": elapsed})
+    return pd.DataFrame(rows, columns=["분야", "구분", "실제", "목표", "달성률", "경과율"])
@@ -0,0 +1,294 @@
+# sales_data.py
+#  - 시트 원본(문자열) → 분석용 타입 프레임 변환
+#  - 데이터 로드 시 한 번만 실행하고, 앱은 결과 프레임을 그대로 사용
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+DATE_COL = "날짜"
+DATE_FORMAT = "%Y-%m-%d"
+
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def records_frame(values):
+    """시트 값(첫 행=헤더) → DataFrame. get_all_records() 와 같은 모양, 값은 문자열."""
+    if not values:
+        return pd.DataFrame()
+    header = list(values[0])
+    w = len(header)
+    return pd.DataFrame([(list(r) + [""] * w)[:w] for r in values[1:]], columns=header)
+
+
+def parse_dates(s):
+    """명시 포맷으로 먼저 파싱하고, 실패한 값만 일반 파서로 재시도."""
+    out = pd.to_datetime(s, format=DATE_FORMAT, errors="coerce")
+    miss = out.isna() & s.notna() & (s.astype(str).str.strip() != "")
+    if miss.any():
+        out[miss] = pd.to_datetime(s[miss], errors="coerce")
+    return out
+
+
+def to_krw(s):
+    """'1,234' / '' / 숫자 혼합 컬럼 → 정수 원화. 숫자가 하나도 없으면 None."""
+    if pd.api.types.is_numeric_dtype(s):
+        num = s
+    else:
+        num = pd.to_numeric(s.astype(str).str.replace(",", "").str.strip(), errors="coerce")
+        if num.isna().all() and (s.astype(str).str.strip() != "").any():
+            return None
+    out = num.fillna(0).round().astype(np.int64)
+    if len(out) and out.min() >= _INT32_MIN and out.max() <= _INT32_MAX:
+        out = out.astype(np.int32)
+    return out
+
+
+def ingest_ledger(raw):
+    """시트1 원본 → 날짜(datetime64) + 거래처별 정수 매출 컬럼.
+
+    날짜가 없는 행은 버리고 날짜순으로 정렬한다. 숫자로 해석되지 않는
+    텍스트 컬럼(비고 등)은 앱에서 쓰지 않으므로 제외한다.
+    """
+    cols = {DATE_COL: parse_dates(raw[DATE_COL])}
+    for c in raw.columns:
+        if c == DATE_COL or not str(c).strip():
+            continue
+        num = to_krw(raw[c])
+        if num is not None:
+            cols[c] = num
+    df = pd.DataFrame(cols)
+    df = df[df[DATE_COL].notna()].sort_values(DATE_COL, kind="stable")
+    return df.reset_index(drop=True)
+
+
+def membership_matrix(columns, groups):
+    """열(거래처) × 그룹 0/1 정수 행렬. groups = [(이름, 거래처들)], 없는 거래처는 무시.
+
+    (행, 열) 금액 행렬 @ 이 행렬 → 모든 그룹 합계를 한 번에.
+    """
+    pos = {c: i for i, c in enumerate(columns)}
+    m = np.zeros((len(pos), len(groups)), dtype=np.int64)
+    for j, (_, vendors) in enumerate(groups):
+        for v in vendors:
+            if v in pos:
+                m[pos[v], j] = 1
+    return m
+
+
+class DailyIndex:
+    """일자 × 거래처 누적합 행렬. 임의 기간 합계 = 두 행의 차.
+
+    cum[i]는 첫 날부터 i일 전날까지의 합(cum[0] = 0)이므로
+    [d1, d2] 합계는 cum[pos(d2)+1] - cum[pos(d1)].
+    """
+
+    def __init__(self, df):
+        vendors = [c for c in df.columns if c != DATE_COL]
+        days = df[DATE_COL].dt.normalize()
+        daily = df[vendors].astype(np.int64).groupby(days).sum()
+        if len(daily):
+            grid = pd.date_range(daily.index.min(), daily.index.max(), freq="D")
+            daily = daily.reindex(grid, fill_value=0)
+        self.first_day = daily.index[0] if len(daily) else pd.Timestamp("1970-01-01")
+        self.n_days = len(daily)
+        self.vendors = {v: i for i, v in enumerate(vendors)}
+        self.cum = np.zeros((self.n_days + 1, len(vendors)), dtype=np.int64)
+        np.cumsum(daily.to_numpy(dtype=np.int64), axis=0, out=self.cum[1:])
+
+    def _pos(self, d):
+        """d 이하 마지막 날까지 포함하는 누적합 행 번호(0..n_days)."""
+        i = (pd.Timestamp(d).normalize() - self.first_day).days + 1
+        return min(max(i, 0), self.n_days)
+
+    def range_vector(self, start, end):
+        """[start, end] 거래처별 합계 벡터(전체 컬럼 순서)."""
+        lo = self._pos(pd.Timestamp(start) - pd.Timedelta(days=1))
+        hi = self._pos(end)
+        if hi <= lo:
+            return np.zeros(self.cum.shape[1], dtype=np.int64)
+        return self.cum[hi] - self.cum[lo]
+
+    def range_matrix(self, starts, ends):
+        """여러 기간 [starts[k], ends[k]] 을 한 번에 → (기간 수, 전체 컬럼) 합계 행렬."""
+        lo = self._positions(pd.DatetimeIndex(starts) - pd.Timedelta(days=1))
+        hi = self._positions(pd.DatetimeIndex(ends))
+        out = self.cum[hi] - self.cum[lo]
+        out[hi <= lo] = 0
+        return out
+
+    def _positions(self, days):
+        i = (days.to_numpy(dtype="datetime64[D]") - np.datetime64(self.first_day, "D")).astype(np.int64) + 1
+        return np.clip(i, 0, self.n_days)
+
+    def days_total(self, days, vendors):
+        """날짜 배열(임의 모양) 각 날의 vendors 합계. 데이터 범위 밖 날은 0."""
+        days = np.asarray(days, dtype="datetime64[D]")
+        if self.n_days == 0:
+            return np.zeros(days.shape, dtype=np.int64)
+        cols = [self.vendors[v] for v in vendors if v in self.vendors]
+        i = (days - np.datetime64(self.first_day, "D")).astype(np.int64).ravel()
+        inside = (i >= 0) & (i < self.n_days)
+        i = np.clip(i, 0, self.n_days - 1)
+        vals = (self.cum[i + 1][:, cols] - self.cum[i][:, cols]).sum(axis=1)
+        return np.where(inside, vals, 0).reshape(days.shape)
+
+    def range_total(self, start, end, vendors):
+        idx = [self.vendors[v] for v in vendors if v in self.vendors]
+        return int(self.range_vector(start, end)[idx].sum())
+
+
+VENDOR_COL = "거래처"
+_MONTH_KEY = re.compile(r"\d{4}-\d{2}")
+
+
+class TargetMatrix:
+    """시트2(거래처 × 'YYYY-MM' 목표)를 정수 행렬로 한 번 변환.
+
+    없는 거래처/월은 0. 월 축 누적합으로 연속 월 구간 합계를 상수 시간에 조회.
+    """
+
+    def __init__(self, df_target):
+        if VENDOR_COL in df_target.columns:
+            df = df_target.drop_duplicates(VENDOR_COL, keep="first").set_index(VENDOR_COL)
+            keys = [c for c in df.columns if _MONTH_KEY.fullmatch(str(c))]
+        else:
+            df, keys = pd.DataFrame(), []
+        if keys:
+            vals = df[keys].apply(
+                lambda x: pd.to_numeric(x.astype(str).str.replace(",", "").str.strip(), errors="coerce"))
+            vals.columns = pd.PeriodIndex(keys, freq="M")
+            grid = pd.period_range(vals.columns.min(), vals.columns.max(), freq="M")
+            vals = vals.reindex(columns=grid)
+            self.first_month = grid[0]
+            self.matrix = vals.fillna(0).round().to_numpy(dtype=np.int64)
+        else:
+            self.first_month = pd.Period("1970-01", freq="M")
+            self.matrix = np.zeros((len(df.index), 0), dtype=np.int64)
+        self.vendors = {v: i for i, v in enumerate(df.index)}
+        self.n_months = self.matrix.shape[1]
+        self.cum = np.zeros((self.matrix.shape[0], self.n_months + 1), dtype=np.int64)
+        np.cumsum(self.matrix, axis=1, out=self.cum[:, 1:])
+
+    def _rows(self, vendors):
+        return [self.vendors[v] for v in vendors if v in self.vendors]
+
+    def range_matrix(self, first_months, last_months):
+        """여러 월 구간을 한 번에 → (구간 수, 목표 행) 합계 행렬."""
+        lo = self._positions(pd.PeriodIndex(first_months, freq="M") - 1)
+        hi = self._positions(pd.PeriodIndex(last_months, freq="M"))
+        out = (self.cum[:, hi] - self.cum[:, lo]).T
+        out[hi <= lo] = 0
+        return out
+
+    def _positions(self, months):
+        i = months.asi8 - self.first_month.ordinal + 1
+        return np.clip(i, 0, self.n_months)
+
+    def to_frame(self):
+        """시트2 와 같은 모양(거래처 + 'YYYY-MM' 열)의 정수 프레임. 저장/복원용."""
+        keys = [str(self.first_month + i) for i in range(self.n_months)]
+        df = pd.DataFrame(self.matrix, columns=keys)
+        df.insert(0, VENDOR_COL, list(self.vendors))
+        return df
+
+    def months_total(self, vendors, year, month_list):
+        """year 의 지정 월들(비연속 허용) 목표 총합."""
+        cols = [p for p in ((pd.Period(year=year, month=m, freq="M") - self.first_month).n for m in month_list)
+                if 0 <= p < self.n_months]
+        return int(self.matrix[np.ix_(self._rows(vendors), cols)].sum())
+
+
+class Snapshot(NamedTuple):
+    """한 번의 시트 조회로 만든 분석용 데이터 묶음(세션 간 공유, 수정 금지)."""
+    df_data: pd.DataFrame
+    daily_index: DailyIndex
+    target_matrix: TargetMatrix
+    loaded_at: datetime
+    source: str = "sheet"                  # "sheet" | "disk"(로컬 스냅샷, 시트와 미확인)
+    vendor_groups: dict = None             # 구성 시트 탭의 {분야: [거래처]}(없으면 None → 설정/기본값)
+    monthly: pd.DataFrame = None           # (연, 월) × 거래처 사전 집계(LEDGER_DB 사용 시, 없으면 df_data 로 계산)
+
+    @property
+    def version(self):
+        return self.loaded_at.isoformat()
+
+
+def build_snapshot(raw_ledger, df_target, loaded_at=None, vendor_groups=None):
+    """시트1 원본 + 시트2 레코드 → Snapshot (ingest/누적합/목표 행렬 한 번에)."""
+    df_data = ingest_ledger(raw_ledger)
+    return Snapshot(df_data, DailyIndex(df_data), TargetMatrix(df_target), loaded_at or datetime.now(),
+                    vendor_groups=vendor_groups)
+
+
+# ===============================
+# 기간 계산(목표 달성율/월별 추이) — 탭/세션과 무관한 순수 계산
+# ===============================
+def last_day_of_month(y, m): return calendar.monthrange(y, m)[1]
+def quarter_of_date(d: date): return (d.month - 1) // 3 + 1
+def quarter_months(q: int): s = 3*(q-1)+1; return [s, s+1, s+2]
+
+
+def goal_progress(daily_index, target_matrix, base, vendors):
+    """연/분기/월 {"y"|"q"|"m": (실제, 목표, 경과율%)} — base(어제) 기준, vendors 합."""
+    vendors = list(vendors)
+    y_start = date(base.year, 1, 1)
+    qms = quarter_months(quarter_of_date(base)); q_start = date(base.year, qms[0], 1)
+    m_start = date(base.year, base.month, 1)
+    q_end = date(base.year, qms[-1], last_day_of_month(base.year, qms[-1]))
+    m_end = date(base.year, base.month, last_day_of_month(base.year, base.month))
+    y_end = date(base.year, 12, 31)
+
+    out = {}
+    for tag, start, end, months in (("y", y_start, y_end, list(range(1,13))),
+                                    ("q", q_start, q_end, qms),
+                                    ("m", m_start, m_end, [base.month])):
+        actual = daily_index.range_total(start, base, vendors) if base >= start else 0
+        target = target_matrix.months_total(vendors, base.year, months)
+        days = (end - start).days + 1
+        elapsed = (min(base, end) - start).days + 1
+        out[tag] = (actual, target, elapsed / days * 100)
+    return out
+
+
+def monthly_totals(df):
+    """원장 → (연, 월) × 거래처 합계."""
+    dates = df[DATE_COL]
+    vendor_cols = [c for c in df.columns if c != DATE_COL]
+    return df[vendor_cols].groupby([dates.dt.year.rename("연"), dates.dt.month.rename("월")]).sum()
+
+
+def monthly_panel_series(df, ref_today, panels, monthly=None):
+    """최근 3개 연도 × 12개월 패널별 시리즈 → (years, {title: {year: Series}}).
+
+    (연, 월) groupby 한 번으로 전체 거래처를 집계한 뒤 패널별로 합친다(monthly 가 주어지면
+    그 사전 집계를 그대로 사용). 올해는 확정된 달(어제가 말일이면 이번 달까지, 아니면 지난달까지)만 남긴다.
+    """
+    ref_yesterday = ref_today - timedelta(days=1)
+    ym = monthly_totals(df) if monthly is None else monthly
+    vendor_cols = list(ym.columns)
+
+    yrs_all = sorted(int(y) for y in ym.index.get_level_values("연").unique())
+    yrs_clip = [y for y in yrs_all if y <= ref_today.year]
+    years = yrs_clip[-3:] if len(yrs_clip) >= 3 else yrs_clip
+
+    last_day_curr = last_day_of_month(ref_yesterday.year, ref_yesterday.month)
+    confirmed_limit = ref_yesterday.month if ref_yesterday.day == last_day_curr else max(1, ref_yesterday.month-1)
+
+    # 모든 패널 합계 = (연월 × 거래처) @ (거래처 × 패널) 한 번
+    totals = pd.DataFrame(ym.to_numpy(dtype=np.int64) @ membership_matrix(vendor_cols, panels),
+                          index=ym.index)
+    out = {}
+    for j, (title, _) in enumerate(panels):
+        grid = totals[j].unstack("월").reindex(index=years, columns=range(1,13), fill_value=0).astype(float)
+        series = {}
+        for y in years:
+            s = grid.loc[y].rename(None)
+            if y == ref_yesterday.year:
+                s.loc[range(confirmed_limit+1, 13)] = np.nan
+            series[y] = s
+        out[title] = series
+    return years, out
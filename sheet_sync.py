@@ -0,0 +1,308 @@
+# sheet_sync.py
+#  - 시트1(일별 원장)은 아래로만 늘어나므로, 마지막으로 받은 행 이후(+겹침 구간)만 조회
+#  - 헤더 변경/행 삽입·삭제가 감지되거나 주기가 지나면 전체 재동기화
+#  - 모든 범위는 values_batch_get 한 번으로 조회, 429/5xx 는 지수 백오프로 재시도
+import random
+import threading
+import time
+import weakref
+
+import pandas as pd
+import requests
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+
+SHEET_NAME_DATA = "시트1"       # 일별 원장
+SHEET_NAME_TARGET = "시트2"     # 거래처 × 월 목표
+
+SCOPES = ["https://spreadsheets.google.com/feeds",
+          "https://www.googleapis.com/auth/drive"]
+
+
+def a1(title, rng=None):
+    """시트 이름을 붙인 A1 범위. 이름의 작은따옴표는 두 번 써서 이스케이프."""
+    quoted = "'" + title.replace("'", "''") + "'"
+    return f"{quoted}!{rng}" if rng else quoted
+
+
+class RequestBudget:
+    """프로세스 단위 요청 한도(토큰 버킷, 분당 per_minute 회)."""
+
+    def __init__(self, per_minute=30):
+        self.capacity = max(1, per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = float(self.capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰이 생길 때까지 대기 후 1개 사용."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retryable(e):
+    if isinstance(e, APIError):
+        code = getattr(getattr(e, "response", None), "status_code", None) or getattr(e, "code", None)
+        return code == 429 or (code is not None and 500 <= code < 600)
+    return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+
+def call_api(fn, budget=None, attempts=5, base_delay=1.0, max_delay=32.0):
+    """예산을 지키며 fn() 호출. 429/5xx/네트워크 오류는 지수 백오프(+지터)로 재시도."""
+    for attempt in range(attempts):
+        if budget is not None:
+            budget.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not _retryable(e):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+
+def batch_reader(sh, budget=None):
+    """ranges → 범위별 행 목록. 스프레드시트 한 번 호출로 여러 범위를 받는다."""
+    def read(ranges):
+        resp = call_api(lambda: sh.values_batch_get(ranges), budget)
+        return [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+    return read
+
+
+class LedgerSync:
+    """append-only 워크시트의 증분 동기화 상태(헤더, 원본 행, 마지막 행 번호)."""
+
+    def __init__(self, overlap_rows=14, full_resync_sec=6 * 3600):
+        self.overlap_rows = overlap_rows          # 최근 N행은 매번 다시 받아 수정분 반영
+        self.full_resync_sec = full_resync_sec    # 안전망: 주기적 전체 재동기화
+        self.header = None
+        self.rows = []                            # 헤더 제외 원본 행(문자열)
+        self.last_full_sync = 0.0
+        self.last_mode = None                     # "full" | "incremental"
+        self._force_full = False
+        self._lock = threading.Lock()
+
+    def request_full(self):
+        self._force_full = True
+
+    def _needs_full(self):
+        return (self.header is None or self._force_full
+                or time.time() - self.last_full_sync >= self.full_resync_sec)
+
+    @staticmethod
+    def _strip_header(row):
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        return row
+
+    def _pad(self, rows):
+        w = len(self.header)
+        return [(list(r) + [""] * w)[:w] for r in rows]
+
+    def _plan(self, title):
+        """이번 조회에 필요한 범위. 전체면 시트 통째, 증분이면 헤더 + 겹침 구간 이후."""
+        if self._needs_full():
+            return "full", [a1(title)]
+        # 시트 행 번호: 1=헤더, 2..=데이터. 겹침 구간 바로 위 행(기준 행)부터 받아 위쪽 삽입/삭제 확인
+        kept = self._kept()
+        start = kept + 1 if kept else 2
+        last_col = rowcol_to_a1(1, len(self.header)).rstrip("0123456789")
+        return "incremental", [a1(title, "1:1"), a1(title, f"A{start}:{last_col}")]
+
+    def _apply_full(self, values):
+        self.header = self._strip_header(values[0]) if values else []
+        self.rows = self._pad(values[1:]) if values else []
+        self.last_full_sync = time.time()
+        self._force_full = False
+        self.last_mode = "full"
+
+    def _kept(self):
+        """증분 조회에서 다시 받지 않고 유지하는 앞쪽 행 수."""
+        return max(0, len(self.rows) - self.overlap_rows)
+
+    def _apply_incremental(self, header_rng, body_rng):
+        header = self._strip_header(header_rng[0]) if header_rng else []
+        if header != self.header:
+            return False
+        kept = self._kept()
+        body = self._pad(body_rng)
+        if kept:
+            # 기준 행이 그대로여야 겹침 구간 위의 행이 밀리지 않은 것(위쪽 삽입/삭제/정렬 감지)
+            if not body or body[0] != self.rows[kept - 1]:
+                return False
+            body = body[1:]
+        # 기존 행이 줄었다면(겹침 구간 안 삭제) 증분 병합 불가
+        if kept + len(body) < len(self.rows):
+            return False
+        self.rows = self.rows[:kept] + body
+        self.last_mode = "incremental"
+        return True
+
+    def sync(self, read, title, extra_ranges=()):
+        """read(ranges)로 워크시트와 동기화.
+
+        extra_ranges(예: 목표 시트)는 같은 요청에 실어 보내고 값을 그대로 돌려준다.
+        반환: (원본 문자열 DataFrame, extra_ranges 값 목록)
+        """
+        extra_ranges = list(extra_ranges)
+        with self._lock:
+            mode, ranges = self._plan(title)
+            values = read(ranges + extra_ranges)
+            mine, extra = values[:len(ranges)], values[len(ranges):]
+            if mode == "full":
+                self._apply_full(mine[0])
+            elif not self._apply_incremental(*mine):
+                self._apply_full(read([a1(title)])[0])
+            return pd.DataFrame(self.rows, columns=self.header), extra
+
+
+def _poll(ref, stop, poll_sec):
+    """poll_sec 마다 갱신 필요 여부 확인. stop 되거나 갱신기가 수거되면 종료."""
+    while not stop.wait(poll_sec):
+        refresher = ref()
+        if refresher is None:
+            return
+        refresher._poll_once()
+        del refresher
+
+
+class SnapshotRefresher:
+    """프로세스 공용 스냅샷 갱신기.
+
+    - 조회는 동시에 하나만(single-flight), 완료되면 참조 교체로 원자적 공개
+    - get()은 첫 로드 이후 네트워크를 기다리지 않음(stale-while-revalidate)
+    - 백그라운드 스레드가 poll_sec 마다 probe(시트 수정 시각 등)를 확인해
+      바뀌었거나 max_age_sec 가 지나면 갱신
+    """
+
+    def __init__(self, fetch, max_age_sec=600, poll_sec=60, probe=None, initial=None):
+        self._fetch = fetch
+        self._probe = probe
+        self.max_age_sec = max_age_sec
+        self.poll_sec = poll_sec
+        self.last_error = None
+        self.last_fetch_sec = None          # 마지막 조회 소요 시간(성공/실패 무관)
+        self.stage = ""                     # 진행 중인 조회 단계(표시용, fetch 가 갱신)
+        self._snapshot = initial            # 예: 로컬 저장본. 시트로 확인 전이므로 stale 취급
+        self._token = None
+        self._fetched_at = None
+        self._inflight = None
+        self._again = False                 # 진행 중 조회 뒤에 한 번 더(fresh 요청)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        # 캐시에서 밀려나 버려지면(cache_resource.clear, 재생성) 확인 스레드도 멈춤
+        weakref.finalize(self, self._stop.set)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                # 스레드가 갱신기를 약한 참조로만 잡아야 버려진 갱신기가 수거된다
+                self._thread = threading.Thread(target=_poll, args=(weakref.ref(self), self._stop, self.poll_sec),
+                                                name="sheet-refresher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        """백그라운드 확인 중지(진행 중인 조회는 끝까지 진행)."""
+        self._stop.set()
+
+    def _poll_once(self):
+        if self._snapshot is None or self.is_stale() or self._changed():
+            self.refresh(wait=True)
+
+    def _read_token(self):
+        if self._probe is None:
+            return None
+        try:
+            return self._probe()
+        except Exception:
+            return None
+
+    def _changed(self):
+        token = self._read_token()
+        return token is not None and token != self._token
+
+    def is_stale(self):
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.max_age_sec
+
+    def _fetch_once(self):
+        started = time.monotonic()
+        try:
+            token = self._read_token()      # 조회 중 수정분은 다음 poll 에서 감지되도록 먼저 읽음
+            snapshot = self._fetch()
+            self._snapshot, self._token = snapshot, token
+            self._fetched_at = time.monotonic()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+        finally:
+            self.last_fetch_sec = time.monotonic() - started
+
+    def _do_fetch(self, done):
+        try:
+            while True:
+                self._fetch_once()
+                with self._lock:
+                    if not self._again:
+                        break
+                    self._again = False     # 진행 중에 들어온 fresh 요청 → 같은 대기자에게 한 번 더 조회
+        finally:
+            with self._lock:
+                self._inflight = None
+                self._again = False
+            done.set()
+
+    def refresh(self, wait=False, fresh=False):
+        """갱신 요청. 이미 진행 중이면 그 조회에 합류한다.
+
+        fresh=True 면 진행 중인 조회가 이 요청 전에 계획된 것이므로(예: 증분 조회 중 전체
+        재동기화 요청) 그 조회가 끝난 뒤 한 번 더 조회하고, 대기는 그것까지 끝나야 풀린다.
+        """
+        with self._lock:
+            done = self._inflight
+            leader = done is None
+            if leader:
+                done = self._inflight = threading.Event()
+            elif fresh:
+                self._again = True
+        if leader and wait:
+            self._do_fetch(done)
+        elif leader:
+            threading.Thread(target=self._do_fetch, args=(done,), daemon=True).start()
+        if wait:
+            done.wait()
+
+    @property
+    def snapshot(self):
+        """현재 스냅샷(없으면 None). 조회를 시작하지 않는다."""
+        return self._snapshot
+
+    def wait(self, timeout=None):
+        """진행 중인 조회가 끝날 때까지(최대 timeout 초) 기다림. 끝났으면 True."""
+        done = self._inflight
+        return done is None or done.wait(timeout)
+
+    def get(self, wait=True):
+        """현재 스냅샷. 최초 1회만 조회를 기다리고, 이후엔 오래됐으면 뒤에서 갱신.
+
+        wait=False 면 아직 스냅샷이 없을 때 조회만 시작하고 None.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh(wait=wait)
+            snapshot = self._snapshot
+            if snapshot is None and wait:
+                raise self.last_error
+        elif self.is_stale():
+            self.refresh()
+        return snapshot
@@ -0,0 +1,58 @@
+# snapshot_store.py
+#  - 분석용 스냅샷을 로컬 Parquet 으로 저장/복원
+#  - 재시작 직후 시트 조회 없이 바로 렌더링, 시트 API 장애 시에도 마지막 데이터로 서비스
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sales_data import DailyIndex, Snapshot, TargetMatrix
+
+LEDGER_FILE = "ledger.parquet"
+TARGET_FILE = "target.parquet"
+_VERSION_KEY = b"bookk.snapshot_version"
+_GROUPS_KEY = b"bookk.vendor_groups"
+
+
+def _write(df, path, version, extra=None):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[_VERSION_KEY] = version.encode()
+    meta.update(extra or {})
+    tmp = path.with_suffix(".tmp")
+    pq.write_table(table.replace_schema_metadata(meta), tmp)
+    os.replace(tmp, path)           # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 교체
+
+
+def _read(path):
+    table = pq.read_table(path, memory_map=True)
+    meta = table.schema.metadata or {}
+    return table.to_pandas(), meta.get(_VERSION_KEY, b"").decode(), meta
+
+
+def save_snapshot(snapshot, directory):
+    """원장/목표 두 파일에 같은 버전 스탬프를 붙여 저장."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    _write(snapshot.target_matrix.to_frame(), directory / TARGET_FILE, snapshot.version)
+    groups = {} if snapshot.vendor_groups is None else {
+        _GROUPS_KEY: json.dumps(snapshot.vendor_groups, ensure_ascii=False).encode()}
+    _write(snapshot.df_data, directory / LEDGER_FILE, snapshot.version, groups)
+
+
+def load_snapshot(directory):
+    """저장된 스냅샷(source="disk"). 없거나 두 파일 버전이 다르면 None."""
+    directory = Path(directory)
+    try:
+        df_data, v_data, meta = _read(directory / LEDGER_FILE)
+        df_target, v_target, _ = _read(directory / TARGET_FILE)
+    except (OSError, pa.ArrowException):
+        return None
+    if not v_data or v_data != v_target:
+        return None
+    groups = json.loads(meta[_GROUPS_KEY]) if _GROUPS_KEY in meta else None
+    return Snapshot(df_data, DailyIndex(df_data), TargetMatrix(df_target),
+                    datetime.fromisoformat(v_data), source="disk", vendor_groups=groups)
@@ -0,0 +1,51 @@
+# tests/test_ledger_store.py
+#  - LedgerStore 병합 회귀 테스트: 시트에 없는 날짜의 보관 이력은 지우지 않는다
+import pandas as pd
+import pytest
+
+from ledger_store import LedgerStore
+from sales_data import DATE_COL, monthly_totals
+
+
+def frame(days, **vendors):
+    return pd.DataFrame({DATE_COL: pd.to_datetime(days), **vendors})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LedgerStore(tmp_path / "ledger.db")
+    # 보관 이력: 2023년 매일 1원(시트에서는 이미 지운 행들)
+    days = pd.date_range("2023-01-01", "2023-12-31", freq="D")
+    store.merge(frame(days, PG사=[1] * len(days)))
+    return store
+
+
+def test_typo_date_keeps_archive(store):
+    sheet = frame(["2002-03-04", "2024-01-01", "2024-01-02"], PG사=[7, 10, 20])
+    store.merge(sheet)
+    df = store.daily_frame()
+    assert df[DATE_COL].dt.year.value_counts().to_dict() == {2023: 365, 2024: 2, 2002: 1}
+    assert int(df["PG사"].sum()) == 365 + 7 + 10 + 20
+
+
+def test_merge_replaces_days_and_months(store):
+    store.merge(frame(["2023-06-01", "2023-06-02"], PG사=[0, 5], 예스24=[3, 0]))
+    df = store.daily_frame(columns=[DATE_COL, "PG사", "예스24"])
+    row = df.set_index(DATE_COL).loc["2023-06-01":"2023-06-03"]
+    assert row.to_numpy().tolist() == [[0, 3], [5, 0], [1, 0]]
+    # 월별 사전 집계 = 일별 이력을 (연, 월)로 다시 묶은 것
+    pd.testing.assert_frame_equal(store.monthly_totals()[["PG사", "예스24"]], monthly_totals(df),
+                                  check_index_type=False)
+
+
+def test_daily_frame_range(store):
+    store.merge(frame(["2024-01-01", "2024-01-02"], PG사=[10, 20], 예스24=[0, 4]))
+    full = store.daily_frame(columns=[DATE_COL, "PG사"])
+    for start, end in (("2023-12-30", "2024-01-01"), ("2020-01-01", "2023-01-01"), (None, "2023-02-01"),
+                       ("2024-01-02", None), ("2025-01-01", None)):
+        mask = full[DATE_COL].between(pd.Timestamp(start or "1900-01-01"), pd.Timestamp(end or "2100-01-01"))
+        got = store.daily_frame(columns=[DATE_COL, "PG사"], start=start, end=end)
+        expect = full[mask].reset_index(drop=True)
+        # 구간 밖에만 매출이 있는 거래처는 열이 없을 수 있음(없는 거래처 = 0)
+        assert not expect.drop(columns=got.columns).to_numpy().any()
+        pd.testing.assert_frame_equal(got, expect[got.columns])
@@ -0,0 +1,105 @@
+# tests/test_sales_data.py
+#  - 누적합 인덱스(DailyIndex/TargetMatrix) 경계 회귀 테스트: 행 마스크 합계(기존 sum_for 방식)와 같아야 한다
+import numpy as np
+import pandas as pd
+import pytest
+
+from sales_data import DATE_COL, DailyIndex, TargetMatrix, ingest_ledger
+
+VENDORS = ["PG사", "예스24", "교보문고"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    """빠진 날(1/4~1/6, 1/15), 같은 날 여러 행, 날짜순이 아닌 행이 섞인 원장."""
+    rows = [("2024-01-03", "1,000", "10", ""), ("2024-01-01", "5", "", "7"),
+            ("2024-01-02", "20", "3", "1"), ("2024-01-02", "30", "4", "2"),
+            ("2024-01-07", "100", "", "9"), ("2024-01-10", "", "50", "")]
+    rows += [(f"2024-01-{d:02d}", str(d), str(d * 2), "1") for d in range(16, 32)]
+    raw = pd.DataFrame(rows, columns=[DATE_COL] + VENDORS)
+    return ingest_ledger(raw)
+
+
+@pytest.fixture(scope="module")
+def index(df):
+    return DailyIndex(df)
+
+
+def naive(df, start, end, vendors=VENDORS):
+    """기준값: 날짜 마스크 후 합계."""
+    mask = (df[DATE_COL] >= pd.Timestamp(start)) & (df[DATE_COL] <= pd.Timestamp(end))
+    return int(df.loc[mask, vendors].to_numpy(dtype=np.int64).sum())
+
+
+RANGES = [
+    ("2024-01-01", "2024-01-31"),       # 전체
+    ("2023-12-01", "2024-01-02"),       # 시작이 첫 날 이전
+    ("2024-01-30", "2024-03-01"),       # 끝이 마지막 날 이후
+    ("2023-01-01", "2025-01-01"),       # 양쪽 모두 밖
+    ("2023-01-01", "2023-12-31"),       # 전부 첫 날 이전
+    ("2024-02-01", "2024-02-29"),       # 전부 마지막 날 이후
+    ("2024-01-04", "2024-01-06"),       # 빠진 날만
+    ("2024-01-05", "2024-01-07"),       # 빠진 날 + 데이터 있는 날
+    ("2024-01-02", "2024-01-02"),       # 같은 날 여러 행
+    ("2024-01-01", "2024-01-01"),       # 첫 날 하루
+    ("2024-01-31", "2024-01-31"),       # 마지막 날 하루
+    ("2024-01-10", "2024-01-03"),       # 시작 > 끝
+    ("2024-02-10", "2023-12-01"),       # 시작 > 끝(둘 다 범위 밖)
+]
+
+
+@pytest.mark.parametrize("start, end", RANGES)
+def test_range_total(df, index, start, end):
+    for vendors in (VENDORS, VENDORS[:1], VENDORS[1:], []):
+        assert index.range_total(start, end, vendors) == naive(df, start, end, vendors)
+
+
+@pytest.mark.parametrize("start, end", RANGES)
+def test_range_vector(df, index, start, end):
+    expect = [naive(df, start, end, [v]) for v in VENDORS]
+    assert index.range_vector(start, end).tolist() == expect
+
+
+def test_range_matrix_matches_range_vector(df, index):
+    starts = pd.DatetimeIndex([s for s, _ in RANGES])
+    ends = pd.DatetimeIndex([e for _, e in RANGES])
+    got = index.range_matrix(starts, ends)
+    expect = [[naive(df, s, e, [v]) for v in VENDORS] for s, e in RANGES]
+    assert got.tolist() == expect
+
+
+def test_days_total(df, index):
+    days = pd.date_range("2023-12-30", "2024-02-02", freq="D")
+    got = index.days_total(days.to_numpy(dtype="datetime64[D]").reshape(5, 7), VENDORS).ravel()
+    assert got.tolist() == [naive(df, d, d) for d in days]
+
+
+def test_unknown_vendor_is_ignored(df, index):
+    assert index.range_total("2024-01-01", "2024-01-31", VENDORS + ["없는 거래처"]) == naive(
+        df, "2024-01-01", "2024-01-31")
+    assert index.days_total(np.array(["2024-01-02"], dtype="datetime64[D]"), ["없는 거래처"]).tolist() == [0]
+
+
+def test_empty_ledger():
+    empty = ingest_ledger(pd.DataFrame({DATE_COL: pd.Series([], dtype=object), "PG사": []}))
+    idx = DailyIndex(empty)
+    assert idx.range_total("2024-01-01", "2024-12-31", ["PG사"]) == 0
+    assert idx.range_matrix(pd.DatetimeIndex(["2024-01-01"]), pd.DatetimeIndex(["2024-01-31"])).tolist() == [[0]]
+    assert idx.days_total(np.array(["2024-01-01"], dtype="datetime64[D]"), ["PG사"]).tolist() == [0]
+
+
+def test_target_range_matrix():
+    # 2024-02 열이 빠진 목표 시트 → 빈 월은 0
+    df_target = pd.DataFrame({"거래처": ["PG사", "예스24", "PG사"], "2024-01": ["1,000", "10", "999"],
+                              "2024-03": ["3", "", "999"], "비고": ["", "", ""]})
+    tm = TargetMatrix(df_target)
+    monthly = {"PG사": {"2024-01": 1000, "2024-03": 3}, "예스24": {"2024-01": 10}}
+
+    def naive_target(first, last):
+        months = [str(p) for p in pd.period_range(first, last, freq="M")] if first <= last else []
+        return [sum(monthly[v].get(m, 0) for m in months) for v in tm.vendors]
+
+    spans = [("2024-01", "2024-03"), ("2023-11", "2024-01"), ("2024-03", "2024-06"), ("2024-02", "2024-02"),
+             ("2023-01", "2023-12"), ("2024-04", "2024-12"), ("2024-03", "2024-01")]
+    got = tm.range_matrix([pd.Period(f) for f, _ in spans], [pd.Period(l) for _, l in spans])
+    assert got.tolist() == [naive_target(pd.Period(f), pd.Period(l)) for f, l in spans]
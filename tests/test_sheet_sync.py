@@ -0,0 +1,254 @@
+# tests/test_sheet_sync.py
+#  - LedgerSync 증분 병합 회귀 테스트: 매번 시트 전체를 읽은 결과(records_frame)와 같아야 한다
+#  - SnapshotRefresher 동시성: single-flight, fresh 재조회, 확인 스레드 정지
+import gc
+import threading
+
+import pandas as pd
+import pytest
+
+from bench.fake_gspread import FakeClient
+from sales_data import records_frame
+from sheet_sync import LedgerSync, SnapshotRefresher, a1, batch_reader
+
+TITLE = "시트1"
+OVERLAP = 3
+
+
+def ledger(n, header=("날짜", "PG사", "예스24")):
+    return [list(header)] + [[f"2024-01-{i + 1:02d}", f"{i * 10:,}", str(i)] for i in range(n)]
+
+
+def naive(values):
+    """기준값: 시트 전체를 한 번에 읽어 프레임으로."""
+    return records_frame(batch_reader(FakeClient({TITLE: values}).spreadsheet)([a1(TITLE)])[0])
+
+
+@pytest.fixture
+def sheet():
+    """(values, sync(), 호출 횟수) — values 를 고치면 다음 sync 에 반영."""
+    values = ledger(20)
+    client = FakeClient({TITLE: values})
+    state = LedgerSync(overlap_rows=OVERLAP)
+    read = batch_reader(client.spreadsheet)
+
+    def sync():
+        df, _ = state.sync(read, TITLE)
+        return df
+
+    sync.state = state
+    sync.calls = lambda: client.calls.get("values_batch_get", 0)
+    return values, sync
+
+
+def check(values, sync, mode):
+    before = sync.calls()
+    df = sync()
+    pd.testing.assert_frame_equal(df, naive(values))
+    assert sync.state.last_mode == mode
+    return sync.calls() - before
+
+
+def test_first_sync_is_full(sheet):
+    values, sync = sheet
+    assert check(values, sync, "full") == 1
+
+
+def test_append(sheet):
+    values, sync = sheet
+    sync()
+    values.extend([["2024-01-21", "1,000", "7"], ["2024-01-22", "2,000", "8"]])
+    assert check(values, sync, "incremental") == 1
+
+
+def test_edit_inside_overlap(sheet):
+    values, sync = sheet
+    sync()
+    values[-OVERLAP][1] = "99,999"
+    values[-1][2] = "123"
+    assert check(values, sync, "incremental") == 1
+
+
+def test_delete_inside_overlap_with_append(sheet):
+    values, sync = sheet
+    sync()
+    del values[-2]
+    values.append(["2024-01-21", "5", "5"])
+    assert check(values, sync, "incremental") == 1
+
+
+def test_shrinking_deletion_above_overlap_falls_back_to_full(sheet):
+    values, sync = sheet
+    sync()
+    del values[5]
+    # 증분 요청 1회 + 전체 재조회 1회
+    assert check(values, sync, "full") == 2
+
+
+def test_insert_above_overlap_falls_back_to_full(sheet):
+    values, sync = sheet
+    sync()
+    values.insert(5, ["2024-01-05", "555", "5"])         # 과거 날짜 행을 중간에 추가(행 수는 늘어남)
+    assert check(values, sync, "full") == 2
+
+
+def test_delete_above_overlap_with_append_falls_back_to_full(sheet):
+    values, sync = sheet
+    sync()
+    del values[5]
+    values.append(["2024-01-21", "5", "5"])             # 행 수는 그대로
+    assert check(values, sync, "full") == 2
+
+
+def test_edit_of_anchor_row_falls_back_to_full(sheet):
+    values, sync = sheet
+    sync()
+    values[-OVERLAP - 1][1] = "1"                       # 겹침 구간 바로 위 기준 행
+    assert check(values, sync, "full") == 2
+
+
+def test_trailing_blank_cell(sheet):
+    values, sync = sheet
+    sync()
+    values[-1][2] = ""                          # API 는 행 끝 빈 칸을 생략해 짧은 행을 준다
+    values.append(["2024-01-21", "", ""])
+    df = sync()
+    assert sync.state.last_mode == "incremental"
+    pd.testing.assert_frame_equal(df, naive(values))
+    assert df.iloc[-1].tolist() == ["2024-01-21", "", ""]
+
+
+def test_trailing_blank_header_cell():
+    values = ledger(10, header=("날짜", "PG사", "예스24", ""))
+    client = FakeClient({TITLE: values})
+    state = LedgerSync(overlap_rows=OVERLAP)
+    read = batch_reader(client.spreadsheet)
+    state.sync(read, TITLE)
+    values.append(["2024-01-11", "1", "2"])
+    df, _ = state.sync(read, TITLE)
+    assert state.last_mode == "incremental"
+    assert list(df.columns) == ["날짜", "PG사", "예스24"]
+    pd.testing.assert_frame_equal(df, naive(values))
+
+
+def test_header_change_falls_back_to_full(sheet):
+    values, sync = sheet
+    sync()
+    for row in values:
+        row.append("1" if row is not values[0] else "알라딘")
+    assert check(values, sync, "full") == 2
+
+
+def test_short_ledger_shorter_than_overlap():
+    values = ledger(2)
+    client = FakeClient({TITLE: values})
+    state = LedgerSync(overlap_rows=OVERLAP)
+    read = batch_reader(client.spreadsheet)
+    state.sync(read, TITLE)
+    values.append(["2024-01-03", "3", "3"])
+    df, _ = state.sync(read, TITLE)
+    assert state.last_mode == "incremental"
+    pd.testing.assert_frame_equal(df, naive(values))
+
+
+def test_request_full_and_extra_ranges(sheet):
+    values, sync = sheet
+    sync()
+    sync.state.request_full()
+    assert check(values, sync, "full") == 1
+    client = FakeClient({TITLE: values, "시트2": [["거래처", "2024-01"], ["PG사", "100"]]})
+    _, extra = LedgerSync().sync(batch_reader(client.spreadsheet), TITLE, [a1("시트2")])
+    assert extra == [[["거래처", "2024-01"], ["PG사", "100"]]]
+
+
+# ===============================
+# SnapshotRefresher
+# ===============================
+class BlockingFetch:
+    """호출마다 started 를 알리고 release() 될 때까지 멈추는 fetch. 반환값 = 호출 순번."""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Semaphore(0)
+        self._gate = threading.Semaphore(0)
+
+    def __call__(self):
+        self.calls += 1
+        n = self.calls
+        self.started.release()
+        assert self._gate.acquire(timeout=5)
+        return n
+
+    def release(self):
+        self._gate.release()
+
+
+def waiter(refresher, **kw):
+    """refresh(wait=True, **kw) 를 별도 스레드에서 — 조회에 합류해 대기 중인지 확인."""
+    t = threading.Thread(target=refresher.refresh, kwargs={"wait": True, **kw}, daemon=True)
+    t.start()
+    t.join(0.2)
+    assert t.is_alive()
+    return t
+
+
+def test_concurrent_refresh_is_single_flight():
+    fetch = BlockingFetch()
+    r = SnapshotRefresher(fetch, poll_sec=3600)
+    first = waiter(r)
+    assert fetch.started.acquire(timeout=5)
+    second = waiter(r)
+    fetch.release()
+    first.join(5)
+    second.join(5)
+    assert not first.is_alive() and not second.is_alive()
+    assert fetch.calls == 1 and r.snapshot == 1
+
+
+def test_fresh_refresh_during_fetch_runs_once_more():
+    fetch = BlockingFetch()
+    r = SnapshotRefresher(fetch, poll_sec=3600)
+    first = waiter(r)
+    assert fetch.started.acquire(timeout=5)
+    fresh = waiter(r, fresh=True)
+    fetch.release()
+    # 진행 중이던 조회가 끝나면 곧바로 한 번 더 — 대기자는 그것까지 기다린다
+    assert fetch.started.acquire(timeout=5)
+    assert r.snapshot == 1
+    first.join(0.2)
+    fresh.join(0.2)
+    assert first.is_alive() and fresh.is_alive()
+    fetch.release()
+    first.join(5)
+    fresh.join(5)
+    assert not first.is_alive() and not fresh.is_alive()
+    assert fetch.calls == 2 and r.snapshot == 2
+    assert not fetch.started.acquire(timeout=0.2)
+
+
+def test_fresh_refresh_when_idle_fetches_once():
+    calls = []
+    r = SnapshotRefresher(lambda: calls.append(1) or len(calls), poll_sec=3600)
+    r.refresh(wait=True, fresh=True)
+    assert calls == [1] and r.snapshot == 1
+
+
+def test_stop_ends_poll_thread():
+    r = SnapshotRefresher(lambda: 1, poll_sec=0.01).start()
+    thread = r._thread
+    r.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_dropped_refresher_ends_poll_thread():
+    calls = []
+    r = SnapshotRefresher(lambda: calls.append(1), poll_sec=0.01, max_age_sec=0).start()
+    thread = r._thread
+    del r
+    gc.collect()
+    thread.join(5)
+    assert not thread.is_alive()
+    n = len(calls)
+    threading.Event().wait(0.1)
+    assert len(calls) == n
@@ -0,0 +1,71 @@
+# vendors.py
+# ===============================
+# 거래처/분야 구성 (레지스트리)
+#  - 기본값은 DEFAULT_GROUPS, 운영에서는 VENDOR_GROUPS 시크릿 또는 구성 시트 탭으로 교체
+#  - 첫 분야가 기준 분야(목표 달성율 도넛, '합계(거래처)'·거래처별 월별 패널)
+#  - 탭/월별 패널은 레지스트리에서 생성
+# ===============================
+GROUP_COL = "분야"
+VENDOR_COL = "거래처"
+
+DEFAULT_GROUPS = {
+    "전체 매출": ["PG사", "예스24", "교보문고", "알라딘", "영풍",
+               "밀리의서재", "크레마클럽"],
+    "리커버": ["교보 리커버", "예스 리커버", "알라딘 리커버", "영풍(리커버)"],
+    "전자책": ["예스(전자책)", "알라딘(전자)"],
+    "구독": ["밀리의서재", "크레마클럽"],
+}
+
+
+def groups_from_values(values):
+    """구성 시트 값(헤더: 분야 | 거래처, 한 행 = 소속 하나) → {분야: [거래처]}.
+
+    분야/거래처 순서는 시트에 처음 나온 순서. 헤더가 없거나 행이 없으면 None.
+    """
+    if not values:
+        return None
+    header = [str(h).strip() for h in values[0]]
+    if GROUP_COL not in header or VENDOR_COL not in header:
+        return None
+    gi, vi = header.index(GROUP_COL), header.index(VENDOR_COL)
+    groups = {}
+    for row in values[1:]:
+        row = list(row) + [""] * len(header)
+        g, v = str(row[gi]).strip(), str(row[vi]).strip()
+        if g and v and v not in groups.setdefault(g, []):
+            groups[g].append(v)
+    return groups or None
+
+
+class VendorRegistry:
+    """분야 → 거래처 소속 정의(탭/월별 패널/분야 목록의 기준).
+
+    분야 합계 자체는 report_engine/monthly_panel_series 가 groups 로 소속 행렬
+    (sales_data.membership_matrix)을 만들어 한 번에 계산한다.
+    """
+
+    def __init__(self, groups):
+        self.groups = {str(g): list(dict.fromkeys(str(v) for v in vs)) for g, vs in groups.items() if vs}
+        if not self.groups:
+            raise ValueError("분야가 하나 이상 필요합니다.")
+
+    @property
+    def names(self):
+        return list(self.groups)
+
+    @property
+    def base_group(self):
+        return self.names[0]
+
+    @property
+    def base_vendors(self):
+        return self.groups[self.base_group]
+
+    def panels(self):
+        """월별 추이 패널 [(제목, 거래처들)]: 기준 분야 합계 + 기준 거래처 개별 + 분야별."""
+        base = self.base_vendors
+        return ([("합계(거래처)", base)] + [(v, [v]) for v in base]
+                + [(f"{g.replace(' ', '')}(분야)", vs) for g, vs in self.groups.items()])
+
+
+DEFAULT_REGISTRY = VendorRegistry(DEFAULT_GROUPS)